@@ -17,3 +17,6 @@ CREATE TABLE spot_1h
     PRIMARY KEY (id),
     UNIQUE (symbol, open_time)
 );
+
+-- RECENT ACTIVITY OF ALL SYMBOLS, READ ONCE PER INTERVAL BY THE SCHEDULER
+CREATE INDEX spot_1h_open_time_idx ON spot_1h (open_time);
@@ -0,0 +1,8 @@
+CREATE TABLE spot_1h_quarantine
+(
+    symbol                                  VARCHAR(20) NOT NULL,
+    open_time                               TIMESTAMP,
+    record                                  TEXT NOT NULL,
+    reasons                                 VARCHAR(200) NOT NULL,
+    quarantined_at                          TIMESTAMP NOT NULL DEFAULT (NOW() AT TIME ZONE 'UTC')
+);
@@ -1,25 +1,30 @@
 """Main."""
 
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime, timedelta
+import json
 import logging
 import os
 import secrets
-from sys import stdout
+import signal
+import threading
 import time
-from typing import Dict, List, Optional, Tuple
+from types import FrameType
+from typing import Dict, List, Optional, Set, Tuple
 
+import requests
+
+from binance_spot_loader.cache import KlineCache
 import binance_spot_loader.date_helpers as date_helpers
+from binance_spot_loader.logging_config import configure_logging
 from binance_spot_loader.model import Kline, Latest
-from binance_spot_loader.persistence import source, target
-import binance_spot_loader.queries as queries
-
-logging.basicConfig(
-    level=os.environ.get("LOG_LEVEL", "INFO").upper(),
-    format="%(asctime)s %(levelname)s [%(filename)s:%(lineno)d]: %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S",
-    stream=stdout,
-)
+from binance_spot_loader.persistence import BaseTarget, build_target, source, Spool
+from binance_spot_loader.scheduler import Scheduler
+import binance_spot_loader.server as server
+from binance_spot_loader.supervision import backoff, Quarantine
+from binance_spot_loader.validation import quarantine_records, Validator
+
 logger = logging.getLogger(__name__)
 
 
@@ -27,126 +32,473 @@ class Loader:
     """Loader class."""
 
     _source: source.Source
-    _target: target.Target
+    _target: BaseTarget
+    _scheduler: Scheduler
+    _spool: Spool
+    _validator: Validator
+    _drainer: Optional[threading.Thread] = None
+    _drain_event: threading.Event
+    _drain_stop: threading.Event
+    _cache: Optional[KlineCache] = None
+    _cache_target: Optional[BaseTarget] = None
+    _cache_lock: threading.Lock
+    _cache_host: str
+    _cache_port: int
+    drain_retry_seconds = 30
+    request_limit = 1000
+
+    # SYMBOLS FETCHED BETWEEN HAND-OVERS TO PERSISTENCE
+    batch_size = 50
+    cycle_backoff_seconds = 10
+    max_cycle_backoff_seconds = 600
+
+    discovery_workers = 8
+    symbols_snapshot_max_age = 24 * 60 * 60
 
     _interval: str
+    _target_connection_string: str
+    _symbols_snapshot: str
     _quote_symbols: Dict[str, int]
     _n_active_symbols: int
 
-    _queries: Dict[str, queries.BaseQueries] = {"1h": queries.Spot1hQueries()}
-
-    _queries_latest: Dict[str, queries.BaseQueriesLatest] = {
-        "1h": queries.Spot1hLatestQueries()
-    }
-
     def __init__(self) -> None:
         self.source_name = "BINANCE"
         self.mode = "FAST"
         self.n_requests = 1
+        self._next_start: Dict[str, int] = {}
+        # SYMBOLS OF REJECTED SEGMENTS, SET BY THE DRAINER, NONE MEANS ALL
+        self._refetch: Optional[Set[str]] = set()
+        self._refetch_lock = threading.Lock()
+        self._quarantine = Quarantine()
+        self._stop = threading.Event()
 
     def setup(self, args: argparse.Namespace) -> None:
         """Set up loader and connections."""
         self._source = source.Source(args.source, args.interval)
-        self._target = target.Target(args.target)
+        self._target = build_target(args.target)
+        self._target_connection_string = args.target
+        self._spool = Spool(os.path.join(args.state_dir, "spool"))
+        self._symbols_snapshot = os.path.join(args.state_dir, "symbols.json")
         self._interval = args.interval
+        self._validator = Validator(self._interval)
+        if args.cache_port:
+            self._cache = KlineCache(
+                args.cache_size, args.cache_symbols, seed=self.load_cached_klines
+            )
+            self._cache_lock = threading.Lock()
+            self._cache_host = args.cache_host
+            self._cache_port = args.cache_port
         quote_symbols_str = args.quote_symbols
         self._quote_symbols = dict(
             (symbol, len(symbol)) for symbol in quote_symbols_str.split(sep=",")
         )
 
+        # THE TARGET CONNECTS ON FIRST USE
         self._source.connect()
-        self._target.connect()
+        self._scheduler = Scheduler(
+            self._interval,
+            list(self._quote_symbols),
+            quote_volume_floor=self._source.mkt_cap_filter,
+        )
 
     def check_request_limit(self) -> None:
         """Check if loader has made 1000 requests."""
         self.n_requests += 1
-        if self.n_requests >= 1000:
+        if self.n_requests >= self.request_limit:
             logger.info("Waiting 1m before requesting more...")
-            time.sleep(60)
+            self._stop.wait(60)
             self.n_requests = 1
 
     def run_once(self, symbol_lst: List[str]) -> None:
         """Run process once."""
         self.mode = "SLOW"
         start = datetime.utcnow()
+        self._source.clock.maybe_sync()
 
         keys = self.get_keys(symbol_lst)
         logger.info(f"Processing {self._n_active_symbols} symbols.")
 
-        record_objs = []
-        new_latest = []
+        n_records = 0
         i = 1
         for symbol, start_time in keys:
+            if self._stop.is_set():
+                logger.info(
+                    f"Stopping, skipped {self._n_active_symbols - i + 1} symbols."
+                )
+                break
             logger.info(f"Processing {symbol} ({i}/{self._n_active_symbols})...")
             i += 1
 
-            raw_records = self._source.get_klines(
-                symbol=symbol, interval=self._interval, start_time=start_time
-            )
-            if not raw_records:
-                logger.warning(f"No response for symbol: {symbol}.")
-                continue
-            self.check_request_limit()
-
-            symbol_record_objs = []
-            for record in raw_records:
-                record_id = self._target.get_next_id(self._interval)
-                symbol_record_objs.append(
-                    Kline.build_record([record_id, symbol] + record)
+            try:
+                raw_records = self._source.get_klines(
+                    symbol=symbol,
+                    interval=self._interval,
+                    start_time=start_time,
+                    limit=self._scheduler.limit(
+                        start_time, self._source.clock.now_ms()
+                    ),
                 )
-            new_latest.append(self.latest_closed(symbol, symbol_record_objs))
-            record_objs.extend(symbol_record_objs)
+            except (requests.RequestException, ValueError) as e:
+                logger.warning(f"Request failed for symbol {symbol}: {e}")
+                raw_records = None
+            self.check_request_limit()
+            if raw_records:
+                self._quarantine.success(symbol)
+                self._spool.append(symbol, raw_records)
+                self.update_next_start(symbol, raw_records)
+                n_records += len(raw_records)
+            else:
+                logger.warning(f"No response for symbol: {symbol}.")
+                self._quarantine.failure(symbol)
 
-        records = [record.as_tuple() for record in record_objs]
-        latest_records = [record.as_tuple() for record in new_latest if record]
+            if (i - 1) % self.batch_size == 0:
+                self.flush()
+        self.flush()
 
-        if len(records) != self._n_active_symbols:
+        if n_records != self._n_active_symbols:
             self.mode = "FAST"
 
-        logger.info("Persiting records...")
-        self._target.execute(self._queries[self._interval].UPSERT, records)
-        self._target.execute(
-            self._queries_latest[self._interval].UPSERT, latest_records
-        )
-        self._target.commit_transaction()
-
-        self.check_trading_status()
+        try:
+            self.check_trading_status()
+        except self._target.Error as e:
+            logger.warning(f"Could not check trading status: {e}")
+            self._target.rollback_transaction()
         end = datetime.utcnow()
         logger.info(
-            f"Persisted klines ({len(records)})"
+            f"Fetched klines ({n_records})"
             f" for {self._n_active_symbols} symbols in {end - start}."
         )
 
+    def flush(self) -> None:
+        """Hand fetched klines over for persistence."""
+        if self._spool.seal() is None:
+            return
+        if self._drainer is not None:
+            self._drain_event.set()
+        else:
+            logger.info("Persisting records...")
+            self.drain_spool(self._target)
+
+    def update_next_start(self, symbol: str, raw_records: List[List]) -> None:
+        """Track next open time to request from the fetched klines."""
+        if len(raw_records) > 1:
+            self._next_start[symbol] = date_helpers.get_next_interval(
+                self._interval, raw_records[-2][0]
+            )
+        elif not date_helpers.check_active(
+            self._interval,
+            date_helpers.binance_timestamp_to_datetime(raw_records[0][0]),
+            now=self._source.clock.now_ms(),
+        ):
+            self._next_start.pop(symbol, None)
+
+    def refetch(self, symbols: Optional[Set[str]]) -> None:
+        """Fetch symbols again from their persisted latest kline.
+
+        Args:
+            symbols: symbols to fetch again, None for all symbols.
+        """
+        with self._refetch_lock:
+            if symbols is None or self._refetch is None:
+                self._refetch = None
+            else:
+                self._refetch.update(symbols)
+
+    def apply_refetch(self) -> None:
+        """Forget where fetching stopped for symbols that have to be fetched again."""
+        with self._refetch_lock:
+            symbols, self._refetch = self._refetch, set()
+        if symbols is None:
+            self._next_start.clear()
+        else:
+            for symbol in symbols:
+                self._next_start.pop(symbol, None)
+
+    def merge_starts(self, latest: List[Tuple]) -> Dict[str, int]:
+        """Merge persisted latest klines with the klines fetched since.
+
+        Args:
+            latest: (symbol, open time, active, ...) rows of the latest table.
+
+        Returns:
+            Start time per known symbol.
+        """
+        starts = {}
+        for k in latest:
+            if k[2] is True:
+                starts[k[0]] = max(
+                    date_helpers.get_next_interval(
+                        self._interval,
+                        date_helpers.datetime_to_binance_timestamp(k[1]),
+                    ),
+                    self._next_start.get(k[0], 0),
+                )
+        known = set(k[0] for k in latest)
+        # SYMBOLS FETCHED BUT NOT PERSISTED YET
+        for symbol, start_time in self._next_start.items():
+            if symbol not in known:
+                starts[symbol] = start_time
+        return starts
+
     def get_keys(self, symbol_lst: List[str]) -> List[Tuple[str, int]]:
         """Get (symbol, timestamp) combinations to request."""
-        latest = self._target.get_latest(self._interval)
-        keys = []
-        if latest:
-            for k in latest:
-                if k[2] is True:
-                    keys.append(
-                        (
-                            k[0],
-                            date_helpers.get_next_interval(
-                                self._interval,
-                                date_helpers.datetime_to_binance_timestamp(k[1]),
-                            ),
-                        )
-                    )
-            new_symbols = list(set(symbol_lst) - set(k[0] for k in latest))
-        else:
-            new_symbols = symbol_lst
+        self.apply_refetch()
+        try:
+            latest = self._target.get_latest(self._interval)
+        except self._target.Error as e:
+            if not self._next_start:
+                raise
+            # KEEP FETCHING WHAT IS ALREADY KNOWN, IT IS SPOOLED UNTIL THE
+            # TARGET IS BACK
+            logger.warning(f"Target unavailable, resuming from fetched klines: {e}")
+            self._target.rollback_transaction()
+            return self.select_keys(list(self._next_start.items()))
+
+        latest = latest or []
+        starts = self.merge_starts(latest)
+        known = set(starts) | set(k[0] for k in latest)
+
+        keys = list(starts.items())
+        new_symbols = [s for s in symbol_lst if s not in known]
         if new_symbols:
-            logger.info("Fetching earliest timestamps for new symbols...")
-            for s in new_symbols:
-                earliest_ts = self._source.get_earliest_valid_timestamp(s)
-                if earliest_ts:
-                    keys.append((s, earliest_ts))
-                self.check_request_limit()
+            keys.extend(self.get_earliest_keys(new_symbols))
+
+        now = self._source.clock.now_ms()
+        if self._scheduler.needs_refresh(now):
+            since = date_helpers.binance_timestamp_to_datetime(
+                self._scheduler.lookback_start(now)
+            )
+            self._scheduler.update(
+                self._target.get_activity(self._interval, since), now
+            )
+
+        return self.select_keys(keys)
+
+    def get_earliest_keys(self, symbols: List[str]) -> List[Tuple[str, int]]:
+        """Get (symbol, earliest timestamp) of new symbols, requested concurrently.
+
+        Requests are submitted in chunks no larger than what is left of the
+        request limit, so the pause in check_request_limit holds all workers.
+        Symbols whose request fails are retried on the next cycle.
+
+        Args:
+            symbols: symbols without persisted klines.
+
+        Returns:
+            (symbol, earliest timestamp) of the symbols found.
+        """
+        logger.info(f"Fetching earliest timestamps for {len(symbols)} new symbols...")
+        keys = []
+        pending = list(symbols)
+        with ThreadPoolExecutor(max_workers=self.discovery_workers) as executor:
+            while pending and not self._stop.is_set():
+                n = self.request_limit - self.n_requests
+                chunk, pending = pending[:n], pending[n:]
+                futures = [
+                    executor.submit(self._source.get_earliest_valid_timestamp, s)
+                    for s in chunk
+                ]
+                for s, future in zip(chunk, futures):
+                    try:
+                        earliest_ts = future.result()
+                    except (requests.RequestException, ValueError) as e:
+                        logger.warning(f"Request failed for symbol {s}: {e}")
+                        earliest_ts = None
+                    if earliest_ts:
+                        keys.append((s, earliest_ts))
+                    self.check_request_limit()
+        return keys
+
+    def select_keys(self, keys: List[Tuple[str, int]]) -> List[Tuple[str, int]]:
+        """Select keys due for polling."""
+        keys = [k for k in keys if not self._quarantine.is_quarantined(k[0])]
+        if self._quarantine:
+            logger.info(f"{len(self._quarantine)} symbols in quarantine.")
+        n_keys = len(keys)
+        keys = self._scheduler.select(keys, self._source.clock.now_ms())
+        if len(keys) < n_keys:
+            logger.info(f"Skipping {n_keys - len(keys)} low activity symbols.")
 
         self._n_active_symbols = len(keys)
         return keys
 
+    def drain_spool(self, target_: BaseTarget) -> None:
+        """Persist sealed spool segments into the target, oldest first.
+
+        Segments whose values the target refuses are moved out of the spool so
+        they do not hold back the ones behind them, and their symbols are
+        fetched again. Other errors are raised and the segment is retried on
+        the next drain.
+
+        Args:
+            target_: target to persist into.
+        """
+        for segment in self._spool.segments():
+            try:
+                n_records = self.persist_segment(target_, segment)
+            except (*target_.DataError, ValueError, ArithmeticError) as e:
+                target_.rollback_transaction()
+                self.refetch(self.segment_symbols(segment))
+                path = self._spool.reject(segment)
+                logger.error(f"Rejected spool segment, moved to {path}: {e}")
+                continue
+            self._spool.remove(segment)
+            logger.info(f"Persisted klines ({n_records}) from {segment}.")
+
+    def segment_symbols(self, segment: str) -> Optional[Set[str]]:
+        """Get the symbols of a spool segment.
+
+        Args:
+            segment: sealed spool segment.
+
+        Returns:
+            Symbols of the segment, None if it can not be read.
+        """
+        try:
+            return set(symbol for symbol, _ in self._spool.read(segment))
+        except ValueError:
+            return None
+
+    def persist_segment(self, target_: BaseTarget, segment: str) -> int:
+        """Persist a spool segment in a single transaction.
+
+        Args:
+            target_: target to persist into.
+            segment: sealed spool segment.
+
+        Returns:
+            Number of persisted klines.
+        """
+        start = time.perf_counter()
+        pages = []
+        quarantined = []
+        for symbol, raw_records in self._spool.read(segment):
+            valid_records, rejected = self._validator.validate(raw_records)
+            if rejected:
+                quarantined.extend(quarantine_records(symbol, rejected))
+            if valid_records:
+                pages.append((symbol, valid_records))
+        validation_time = time.perf_counter() - start
+        logger.info(
+            f"Validated klines in {validation_time * 1000:.1f}ms: "
+            f"{self._validator.report()}."
+        )
+
+        record_ids = target_.get_next_ids(
+            self._interval, sum(len(raw_records) for _, raw_records in pages)
+        )
+
+        record_objs: List[Kline] = []
+        new_latest = []
+        page_objs = []
+        for symbol, raw_records in pages:
+            first_id = len(record_objs)
+            symbol_record_objs = Kline.build_records(
+                record_ids[first_id:], symbol, raw_records
+            )
+            new_latest.append(self.latest_closed(symbol, symbol_record_objs))
+            record_objs.extend(symbol_record_objs)
+            page_objs.append((symbol, symbol_record_objs))
+
+        records = [record.as_tuple() for record in record_objs]
+        latest_records = [record.as_tuple() for record in new_latest if record]
+
+        # UPSERTS MAKE REPLAYING A SEGMENT AFTER A CRASH IDEMPOTENT
+        target_.execute(target_.queries(self._interval).UPSERT, records)
+        target_.execute(target_.queries_latest(self._interval).UPSERT, latest_records)
+        target_.execute(target_.queries(self._interval).QUARANTINE, quarantined)
+        target_.commit_transaction()
+
+        if self._cache is not None:
+            now = self._source.clock.now_ms()
+            for symbol, symbol_record_objs in page_objs:
+                self._cache.add(
+                    symbol,
+                    [
+                        k
+                        for k in symbol_record_objs
+                        if date_helpers.datetime_to_binance_timestamp(k.close_time)
+                        < now
+                    ],
+                )
+
+        return len(records)
+
+    def load_cached_klines(self, symbol: str, n: int) -> List[Kline]:
+        """Load the last n persisted closed klines of a symbol into the cache.
+
+        Called from the drainer and the cache server threads, which share a
+        target of their own.
+
+        Args:
+            symbol: symbol to load.
+            n: number of klines.
+
+        Returns:
+            Closed klines ordered by open time, empty if none can be loaded.
+        """
+        with self._cache_lock:
+            try:
+                if self._cache_target is None:
+                    self._cache_target = build_target(self._target_connection_string)
+                rows = self._cache_target.get_recent_klines(self._interval, symbol, n)
+                self._cache_target.rollback_transaction()
+            except self._target.Error as e:
+                logger.warning(f"Could not load cached klines for {symbol}: {e}")
+                self._cache_target = None
+                return []
+        return [Kline.from_row(row) for row in rows]
+
+    def start_drainer(self) -> None:
+        """Drain the spool into the target in the background."""
+        self._drain_event = threading.Event()
+        self._drain_stop = threading.Event()
+        self._drainer = threading.Thread(
+            target=self._drain_loop, name="drainer", daemon=True
+        )
+        self._drainer.start()
+
+    def stop_drainer(self) -> None:
+        """Drain the spool one last time and stop the background drainer."""
+        if self._drainer is None:
+            return
+        self._drain_stop.set()
+        self._drain_event.set()
+        self._drainer.join()
+        self._drainer = None
+
+    def _drain_loop(self) -> None:
+        drain_target = None
+        while True:
+            stopping = self._drain_stop.is_set()
+            try:
+                if drain_target is None:
+                    drain_target = build_target(self._target_connection_string)
+                self.drain_spool(drain_target)
+            except self._target.Error as e:
+                logger.warning(f"Could not drain spool, retrying: {e}")
+                drain_target = self._reset_drain_target(drain_target)
+            except Exception as e:
+                # THE DRAINER MUST OUTLIVE ANY ERROR, OR THE SPOOL ONLY GROWS
+                logger.exception(f"Drainer failed, retrying: {e}")
+                drain_target = self._reset_drain_target(drain_target)
+            if stopping:
+                return
+            self._drain_event.wait(timeout=self.drain_retry_seconds)
+            self._drain_event.clear()
+
+    def _reset_drain_target(
+        self, drain_target: Optional[BaseTarget]
+    ) -> Optional[BaseTarget]:
+        if drain_target is None:
+            return None
+        try:
+            drain_target.rollback_transaction()
+        except Exception as e:
+            logger.warning(f"Dropping drainer connection: {e}")
+            return None
+        return drain_target
+
     def latest_closed(self, symbol: str, record_objs: List[Kline]) -> Optional[Latest]:
         """Build Latest object from record objects."""
         res = None
@@ -163,7 +515,11 @@ class Loader:
                 ]
             )
         else:
-            active = date_helpers.check_active(self._interval, record_objs[0].open_time)
+            active = date_helpers.check_active(
+                self._interval,
+                record_objs[0].open_time,
+                now=self._source.clock.now_ms(),
+            )
             if not active:
                 last_kline = record_objs[0]
                 res = Latest.build_record(
@@ -184,29 +540,66 @@ class Loader:
         trading_status = self._source.get_trading_status(inactive_symbols)
         self.check_request_limit()
         if trading_status:
-            active_symbols = [(s[0],) for s in trading_status if s[1] == "TRADING"]
+            active_symbols = [(s[0], True) for s in trading_status if s[1] == "TRADING"]
             if active_symbols:
                 self._target.execute(
-                    self._queries_latest[self._interval].CORRECT_TRADING_STATUS,
+                    self._target.queries_latest(self._interval).CORRECT_TRADING_STATUS,
                     active_symbols,
                 )
                 self._target.commit_transaction()
-                for symbol in active_symbols:
+                for symbol, _ in active_symbols:
                     logger.info(f"Reinstated {symbol}.")
 
-    def run_as_service(self) -> None:
+    def get_symbol_list(self) -> Optional[List[str]]:
+        """Get symbols to load, from the snapshot of a previous start if recent."""
+        quote_symbols = sorted(self._quote_symbols)
+        path = self._symbols_snapshot
+        if (
+            os.path.exists(path)
+            and time.time() - os.path.getmtime(path) < self.symbols_snapshot_max_age
+        ):
+            with open(path) as f:
+                snapshot = json.load(f)
+            if snapshot["quote_symbols"] == quote_symbols:
+                logger.info(f"Loaded {len(snapshot['symbols'])} symbols from snapshot.")
+                return snapshot["symbols"]
+
+        logger.info("Fetching symbols...")
+        symbol_list = self._source.get_symbols(self._quote_symbols)
+        if symbol_list:
+            with open(f"{path}.tmp", "w") as f:
+                json.dump({"quote_symbols": quote_symbols, "symbols": symbol_list}, f)
+            os.replace(f"{path}.tmp", path)
+        return symbol_list
+
+    def run_as_service(self, symbol_list: List[str]) -> None:
         """Run process continuously."""
         # ON THE FIRST RUN IT GETS SYMBOLS ACCORDING TO FILTERS
         # AFTER THAT IT ONLY UPDATE THOSE SYMBOLS
-        logger.info("Fetching symbols...")
-        symbol_list = self._source.get_symbols(self._quote_symbols)
-        if not symbol_list:
-            return None
         logger.info("Running...")
-        break_process = False
-        while not break_process:
+        cache_server = None
+        if self._cache is not None:
+            cache_server = server.serve(self._cache, self._cache_host, self._cache_port)
+        self.start_drainer()
+        try:
+            self.run_loop(symbol_list)
+        finally:
+            self.stop_drainer()
+            if cache_server is not None:
+                cache_server.shutdown()
+
+        logger.info("Terminating...")
+
+    def run_loop(self, symbol_list: List[str]) -> None:
+        """Run process until stopped, backing off after failed cycles."""
+        failures = 0
+        while not self._stop.is_set():
+            if self._drainer is not None and not self._drainer.is_alive():
+                logger.error("Drainer is not running, restarting it.")
+                self.start_drainer()
             try:
                 self.run_once(symbol_list)
+                failures = 0
                 t = None
                 if self.mode == "FAST":
                     t = secrets.choice([1, 5] + [i for i in range(1, 5)])
@@ -221,28 +614,61 @@ class Loader:
                         + [i for i in range(interval_sec, interval_sec + 10)]
                     )
                     logger.info(f"Waiting {timedelta(seconds=t)}... ({self.mode})")
-                if t:
-                    time.sleep(t)
-                else:
+                if not t:
                     logger.warning("No waiting mode selected.")
                     return
             except Exception as e:
-                logger.warning("Error while importing:", e)
-                break_process = True
+                failures += 1
+                t = backoff(
+                    failures,
+                    self.cycle_backoff_seconds,
+                    self.max_cycle_backoff_seconds,
+                )
+                logger.exception(f"Error while importing, retrying in {t:.0f}s: {e}")
+            self._stop.wait(t)
 
-        logger.info("Terminating...")
+    def handle_signal(self, signum: int, frame: Optional[FrameType]) -> None:
+        """Stop after in-flight requests, persisting what was fetched."""
+        logger.info(f"Received {signal.Signals(signum).name}, shutting down...")
+        self._stop.set()
 
     def run(self, args: argparse.Namespace) -> None:
         """Run process."""
         logger.info("Starting process...")
+        signal.signal(signal.SIGTERM, self.handle_signal)
+        signal.signal(signal.SIGINT, self.handle_signal)
+
+        timings: Dict[str, float] = {}
+        start = time.perf_counter()
         self.setup(args=args)
+        timings["setup"] = time.perf_counter() - start
 
+        phase_start = time.perf_counter()
+        self._source.clock.sync()
+        timings["clock"] = time.perf_counter() - phase_start
+
+        phase_start = time.perf_counter()
+        symbol_list = self.get_symbol_list()
+        timings["symbols"] = time.perf_counter() - phase_start
+
+        if not args.as_service:
+            # REPLAY WHATEVER A PREVIOUS RUN FETCHED BUT DID NOT PERSIST, THE
+            # SERVICE DOES IT IN THE BACKGROUND
+            phase_start = time.perf_counter()
+            self.drain_spool(self._target)
+            timings["replay"] = time.perf_counter() - phase_start
+
+        timings["total"] = time.perf_counter() - start
+        logger.info(
+            "Startup: " + ", ".join(f"{k} {v:.3f}s" for k, v in timings.items()) + "."
+        )
+
+        if not symbol_list:
+            return
         if args.as_service:
-            self.run_as_service()
+            self.run_as_service(symbol_list)
         else:
-            symbol_list = self._source.get_symbols(self._quote_symbols)
-            if symbol_list:
-                self.run_once(symbol_list)
+            self.run_once(symbol_list)
 
 
 def parse_args() -> argparse.Namespace:
@@ -275,7 +701,8 @@ def parse_args() -> argparse.Namespace:
         default=os.environ.get("TARGET"),
         help="Postgres connection URL. e.g.: "
         "user=username password=password "
-        "host=localhost port=5432 dbname=binance",
+        "host=localhost port=5432 dbname=binance, "
+        "or an SQLite file. e.g.: sqlite:///binance.db",
     )
 
     parser.add_argument(
@@ -299,12 +726,61 @@ def parse_args() -> argparse.Namespace:
         "USDT,TUSD,BUSD,BNB,BTC,ETH",
     )
 
+    parser.add_argument(
+        "--state_dir",
+        dest="state_dir",
+        type=str,
+        required=False,
+        default=os.environ.get("STATE_DIR", default="state"),
+        help="Directory for local state, the spool of fetched klines waiting "
+        "to be persisted and the symbol snapshot. Must outlive the process, "
+        "e.g. a mounted volume.",
+    )
+
+    parser.add_argument(
+        "--cache_port",
+        dest="cache_port",
+        type=int,
+        required=False,
+        default=os.environ.get("CACHE_PORT"),
+        help="Serve the latest closed klines from memory on this port. "
+        "Disabled if not set.",
+    )
+
+    parser.add_argument(
+        "--cache_host",
+        dest="cache_host",
+        type=str,
+        required=False,
+        default=os.environ.get("CACHE_HOST", default="127.0.0.1"),
+        help="Address the kline cache is served on.",
+    )
+
+    parser.add_argument(
+        "--cache_size",
+        dest="cache_size",
+        type=int,
+        required=False,
+        default=os.environ.get("CACHE_SIZE", default=500),
+        help="Closed klines cached per symbol.",
+    )
+
+    parser.add_argument(
+        "--cache_symbols",
+        dest="cache_symbols",
+        type=int,
+        required=False,
+        default=os.environ.get("CACHE_SYMBOLS", default=2000),
+        help="Symbols cached before evicting the least recently used.",
+    )
+
     a = parser.parse_args()
 
     return a
 
 
 if __name__ == "__main__":
+    configure_logging()
     parsed_args = parse_args()
 
     loader = Loader()
@@ -0,0 +1,110 @@
+"""Kline cache."""
+
+from collections import deque, OrderedDict
+import threading
+import time
+from typing import Callable, Deque, List, Optional
+
+from binance_spot_loader.model import Kline
+
+
+class KlineCache:
+    """Most recent closed klines per symbol, filled as they are persisted.
+
+    Each symbol keeps a bounded ring buffer, and the least recently used
+    symbols are evicted once more than ``max_symbols`` are cached. A symbol's
+    buffer is seeded with its latest persisted klines when the symbol is first
+    written or requested, so a restart does not serve truncated history.
+    Symbols without persisted klines are not looked up again for
+    ``miss_seconds``.
+    """
+
+    def __init__(
+        self,
+        size: int,
+        max_symbols: int,
+        seed: Optional[Callable[[str, int], List[Kline]]] = None,
+        miss_seconds: float = 60,
+    ) -> None:
+        """Kline cache.
+
+        Args:
+            size: Klines kept per symbol.
+            max_symbols: Symbols kept before evicting the least recently used.
+            seed: Callable returning the last n persisted closed klines of a
+                symbol, ordered by open time.
+            miss_seconds: Time before seeding a symbol without klines again.
+        """
+        self._size = size
+        self._max_symbols = max_symbols
+        self._seed = seed
+        self._miss_seconds = miss_seconds
+        self._klines: "OrderedDict[str, Deque[Kline]]" = OrderedDict()
+        self._misses: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def _load(self, symbol: str, retry: bool = False) -> None:
+        if self._seed is None:
+            return
+        with self._lock:
+            if not retry and self._misses.get(symbol, 0) > time.monotonic():
+                return
+        # OUTSIDE THE LOCK, READERS OF OTHER SYMBOLS DO NOT WAIT FOR THE TARGET
+        klines = self._seed(symbol, self._size)
+        with self._lock:
+            if not klines:
+                # UNKNOWN SYMBOLS ARE BOUNDED LIKE CACHED ONES
+                self._misses[symbol] = time.monotonic() + self._miss_seconds
+                self._misses.move_to_end(symbol)
+                while len(self._misses) > self._max_symbols:
+                    self._misses.popitem(last=False)
+            elif symbol not in self._klines:
+                self._klines[symbol] = deque(klines, maxlen=self._size)
+                self._evict()
+
+    def _evict(self) -> None:
+        while len(self._klines) > self._max_symbols:
+            self._klines.popitem(last=False)
+
+    def add(self, symbol: str, klines: List[Kline]) -> None:
+        """Add closed klines of the symbol, ordered by open time."""
+        if not klines:
+            return
+        with self._lock:
+            cached = symbol in self._klines
+        if not cached:
+            # JUST PERSISTED, SO A PREVIOUS MISS NO LONGER HOLDS
+            self._load(symbol, retry=True)
+        with self._lock:
+            buffer = self._klines.get(symbol)
+            if buffer is None:
+                buffer = deque(maxlen=self._size)
+                self._klines[symbol] = buffer
+                self._misses.pop(symbol, None)
+            for kline in klines:
+                if buffer and kline.open_time <= buffer[-1].open_time:
+                    if kline.open_time == buffer[-1].open_time:
+                        buffer[-1] = kline
+                    # OLDER KLINES (E.G. A REPLAYED SPOOL) ARE NOT CACHED
+                    continue
+                buffer.append(kline)
+            self._klines.move_to_end(symbol)
+            self._evict()
+
+    def get(self, symbol: str, n: int) -> Optional[List[Kline]]:
+        """Get the last n closed klines of the symbol, None if not available."""
+        with self._lock:
+            cached = symbol in self._klines
+        if not cached:
+            self._load(symbol)
+        with self._lock:
+            buffer = self._klines.get(symbol)
+            if buffer is None:
+                return None
+            self._klines.move_to_end(symbol)
+            return list(buffer)[-n:] if n > 0 else []
+
+    def symbols(self) -> List[str]:
+        """Get cached symbols."""
+        with self._lock:
+            return list(self._klines)
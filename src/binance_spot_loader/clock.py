@@ -0,0 +1,70 @@
+"""Exchange clock."""
+
+import logging
+import time
+from typing import Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class Clock:
+    """Clock synchronized with the Binance server time.
+
+    The offset against the server is measured on sync and the current exchange
+    time is then derived from the local monotonic clock, so wall clock jumps
+    on the host do not leak into the loader.
+    """
+
+    _ns_per_ms = 1_000_000
+
+    def __init__(
+        self,
+        server_time: Callable[[], Optional[int]],
+        resync_seconds: int = 600,
+    ) -> None:
+        """Exchange clock.
+
+        Args:
+            server_time: Callable returning the server time (ms).
+            resync_seconds: Seconds after which the offset is synced again.
+        """
+        self._server_time = server_time
+        self._resync_ns = resync_seconds * 1_000_000_000
+
+        self.offset_ms = 0
+        self._base_ms = time.time_ns() // self._ns_per_ms
+        self._base_ns = time.monotonic_ns()
+        self._synced_ns: Optional[int] = None
+
+    def sync(self) -> None:
+        """Sync offset against the server time."""
+        sent_ns = time.monotonic_ns()
+        server_ms = self._server_time()
+        received_ns = time.monotonic_ns()
+        if server_ms is None:
+            logger.warning("Could not sync clock, keeping previous offset.")
+            return
+
+        # Assume the server stamped the response halfway through the round trip.
+        self._base_ns = (sent_ns + received_ns) // 2
+        self._base_ms = server_ms
+        self._synced_ns = received_ns
+
+        local_ms = time.time_ns() // self._ns_per_ms
+        self.offset_ms = self.now_ms() - local_ms
+        logger.info(
+            f"Clock synced (offset {self.offset_ms} ms, "
+            f"round trip {(received_ns - sent_ns) // self._ns_per_ms} ms)."
+        )
+
+    def maybe_sync(self) -> None:
+        """Sync offset if it was never synced or is stale."""
+        if (
+            self._synced_ns is None
+            or time.monotonic_ns() - self._synced_ns >= self._resync_ns
+        ):
+            self.sync()
+
+    def now_ms(self) -> int:
+        """Current exchange time (ms)."""
+        return self._base_ms + (time.monotonic_ns() - self._base_ns) // self._ns_per_ms
@@ -1,7 +1,13 @@
 """Date helper functions."""
 
-from datetime import datetime, timezone
-from typing import Dict
+from datetime import datetime, timedelta
+from functools import lru_cache
+import time
+from typing import Dict, Iterable, List, Optional
+
+# Naive UTC epoch, timestamps are persisted as UTC without time zone.
+EPOCH = datetime(1970, 1, 1)
+ONE_MS = timedelta(milliseconds=1)
 
 
 seconds_per_unit: Dict[str, int] = {
@@ -13,19 +19,22 @@ seconds_per_unit: Dict[str, int] = {
 
 
 def binance_timestamp_to_datetime(timestamp: int) -> datetime:
-    """Converts Binance timestamp (ms) into datetime."""
-    ts = timestamp / 1000
-    # UTC
-    return datetime.utcfromtimestamp(ts)
+    """Converts Binance timestamp (ms) into datetime (UTC)."""
+    return EPOCH + timedelta(milliseconds=timestamp)
+
+
+def binance_timestamps_to_datetimes(timestamps: Iterable[int]) -> List[datetime]:
+    """Converts a batch of Binance timestamps (ms) into datetimes (UTC)."""
+    epoch = EPOCH
+    return [epoch + timedelta(milliseconds=ts) for ts in timestamps]
 
 
 def datetime_to_binance_timestamp(d: datetime) -> int:
-    """Converts datetime into Binance timestamp (ms)."""
-    # UTC
-    timestamp = int(d.replace(tzinfo=timezone.utc).timestamp() * 1000)
-    return timestamp
+    """Converts datetime (UTC) into Binance timestamp (ms)."""
+    return (d.replace(tzinfo=None) - EPOCH) // ONE_MS
 
 
+@lru_cache(maxsize=None)
 def interval_to_milliseconds(interval: str) -> int:
     """Convert a Binance interval string to milliseconds.
 
@@ -43,12 +52,18 @@ def get_next_interval(interval: str, timestamp: int) -> int:
     return timestamp + interval_to_milliseconds(interval)
 
 
-def check_active(interval: str, d: datetime) -> bool:
-    """Check if datetime is recent."""
+def check_active(interval: str, d: datetime, now: Optional[int] = None) -> bool:
+    """Check if datetime is recent.
+
+    Args:
+        interval: Binance interval.
+        d: Open time of the kline (UTC).
+        now: Current exchange time (ms), defaults to the local clock.
+
+    Returns:
+        Whether the kline is within one interval of now.
+    """
     ts = datetime_to_binance_timestamp(d)
-    lag1 = int(interval[:-1]) * seconds_per_unit[interval[-1]] * 1000
-    now = datetime_to_binance_timestamp(datetime.utcnow())
-    if now - lag1 >= ts:
-        return False
-    else:
-        return True
+    if now is None:
+        now = time.time_ns() // 1_000_000
+    return now - interval_to_milliseconds(interval) < ts
@@ -0,0 +1,179 @@
+"""Export.
+
+Incrementally exports closed klines into Parquet files, one per symbol and
+month, e.g. ``{export_dir}/spot_1h/BTCUSDT/2023-05.parquet``. Requires pyarrow,
+installed with the ``export`` extra (``pip install .[export]``) and included in
+requirements.txt for the image.
+"""
+
+import argparse
+from datetime import datetime
+import json
+import logging
+import os
+import time
+from typing import Dict, List, Optional, Tuple
+
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.parquet as pq
+
+from binance_spot_loader.logging_config import configure_logging
+from binance_spot_loader.persistence import BaseTarget, build_target
+
+logger = logging.getLogger(__name__)
+
+
+class Exporter:
+    """Exporter class."""
+
+    _price = pa.decimal128(24, 8)
+    schema = pa.schema(
+        [
+            ("id", pa.int64()),
+            ("symbol", pa.string()),
+            ("open_time", pa.timestamp("ms")),
+            ("open_price", _price),
+            ("high_price", _price),
+            ("low_price", _price),
+            ("close_price", _price),
+            ("volume", _price),
+            ("close_time", pa.timestamp("ms")),
+            ("quote_volume", _price),
+            ("trades", pa.int32()),
+            ("taker_buy_volume", _price),
+            ("taker_buy_quote_volume", _price),
+        ]
+    )
+
+    _watermarks_file = "_watermarks.json"
+
+    def __init__(self, target_: BaseTarget, interval: str, path: str) -> None:
+        """Kline exporter.
+
+        Args:
+            target_: Target to export from.
+            interval: kline interval.
+            path: Root directory of the export.
+        """
+        self._target = target_
+        self._interval = interval
+        self._path = os.path.join(path, f"spot_{interval}")
+        os.makedirs(self._path, exist_ok=True)
+
+    def load_watermarks(self) -> Dict[str, datetime]:
+        """Get latest exported open time per symbol."""
+        path = os.path.join(self._path, self._watermarks_file)
+        if not os.path.exists(path):
+            return {}
+        with open(path) as f:
+            return {k: datetime.fromisoformat(v) for k, v in json.load(f).items()}
+
+    def save_watermarks(self, watermarks: Dict[str, datetime]) -> None:
+        """Persist latest exported open time per symbol."""
+        path = os.path.join(self._path, self._watermarks_file)
+        with open(f"{path}.tmp", "w") as f:
+            json.dump({k: v.isoformat() for k, v in watermarks.items()}, f)
+        os.replace(f"{path}.tmp", path)
+
+    def run(self) -> None:
+        """Export klines closed since the last export."""
+        start = time.perf_counter()
+        watermarks = self.load_watermarks()
+
+        n_rows = 0
+        n_files = 0
+        key: Optional[Tuple[str, str]] = None
+        rows: List[Tuple] = []
+        for row in self._target.stream_klines(self._interval, watermarks):
+            row_key = (row[1], row[2].strftime("%Y-%m"))
+            if row_key != key and rows:
+                self.write_partition(key, rows)
+                watermarks[rows[-1][1]] = rows[-1][2]
+                n_rows += len(rows)
+                n_files += 1
+                rows = []
+            key = row_key
+            rows.append(row)
+        if rows:
+            self.write_partition(key, rows)
+            watermarks[rows[-1][1]] = rows[-1][2]
+            n_rows += len(rows)
+            n_files += 1
+
+        self.save_watermarks(watermarks)
+        logger.info(
+            f"Exported klines ({n_rows}) into {n_files} files "
+            f"in {time.perf_counter() - start:.1f}s."
+        )
+
+    def write_partition(self, key: Tuple[str, str], rows: List[Tuple]) -> None:
+        """Append rows to the symbol/month Parquet file."""
+        symbol, month = key
+        directory = os.path.join(self._path, symbol)
+        os.makedirs(directory, exist_ok=True)
+        path = os.path.join(directory, f"{month}.parquet")
+
+        table = pa.Table.from_pylist(
+            [dict(zip(self.schema.names, row)) for row in rows], schema=self.schema
+        )
+        if os.path.exists(path):
+            existing = pq.read_table(path, schema=self.schema)
+            # ROWS MAY BE EXPORTED TWICE IF A PREVIOUS RUN DIED BEFORE SAVING
+            # ITS WATERMARKS
+            keep = pc.invert(pc.is_in(existing["open_time"], table["open_time"]))
+            table = pa.concat_tables([existing.filter(keep), table])
+
+        pq.write_table(table, f"{path}.tmp")
+        os.replace(f"{path}.tmp", path)
+
+
+def parse_args() -> argparse.Namespace:
+    """Parses user input arguments when starting the export."""
+    parser = argparse.ArgumentParser(prog="python -m binance_spot_loader.export")
+
+    parser.add_argument(
+        "--target",
+        dest="target",
+        type=str,
+        required=False,
+        default=os.environ.get("TARGET"),
+        help="Postgres connection URL. e.g.: "
+        "user=username password=password "
+        "host=localhost port=5432 dbname=binance, "
+        "or an SQLite file. e.g.: sqlite:///binance.db",
+    )
+
+    parser.add_argument(
+        "--interval",
+        dest="interval",
+        type=str,
+        required=False,
+        default=os.environ.get("INTERVAL", default="1h"),
+        help="Kline interval to export. e.g.: 1h",
+    )
+
+    parser.add_argument(
+        "--export_dir",
+        dest="export_dir",
+        type=str,
+        required=False,
+        default=os.environ.get("EXPORT_DIR", default="export"),
+        help="Root directory of the Parquet export.",
+    )
+
+    a = parser.parse_args()
+
+    return a
+
+
+if __name__ == "__main__":
+    configure_logging()
+    parsed_args = parse_args()
+
+    exporter = Exporter(
+        build_target(parsed_args.target),
+        parsed_args.interval,
+        parsed_args.export_dir,
+    )
+    exporter.run()
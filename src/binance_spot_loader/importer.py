@@ -0,0 +1,282 @@
+"""Importer.
+
+Bulk loads klines from Binance public data archives, i.e. the monthly and daily
+``{SYMBOL}-{interval}-{date}.zip`` files (and their ``.CHECKSUM`` files) of
+https://data.binance.vision, from a local directory or a mounted mirror. The
+latest closed kline of every imported symbol is recorded so the loader only
+requests the recent tail through the REST API.
+"""
+
+import argparse
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor
+import csv
+import hashlib
+import io
+import logging
+import os
+import re
+import time
+from typing import Deque, Dict, Iterator, List, Optional, Tuple
+import zipfile
+
+import binance_spot_loader.date_helpers as date_helpers
+from binance_spot_loader.logging_config import configure_logging
+from binance_spot_loader.model import Kline, Latest
+from binance_spot_loader.persistence import BaseTarget, build_target
+from binance_spot_loader.validation import quarantine_records, Validator
+
+logger = logging.getLogger(__name__)
+
+# SPOT ARCHIVES SWITCHED FROM MILLISECOND TO MICROSECOND TIMESTAMPS IN 2025
+_MAX_MS_TIMESTAMP = 10**14
+
+
+def verify_checksum(path: str) -> bool:
+    """Check archive against its .CHECKSUM file (sha256)."""
+    checksum_path = f"{path}.CHECKSUM"
+    if not os.path.exists(checksum_path):
+        return False
+    with open(checksum_path) as f:
+        expected = f.read().split()[0].lower()
+
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(1 << 20), b""):
+            digest.update(chunk)
+    return digest.hexdigest() == expected
+
+
+def read_archive(path: str) -> Optional[List[List]]:
+    """Read archive into raw klines, in the same layout as the REST API.
+
+    Args:
+        path: kline archive.
+
+    Returns:
+        Raw klines, None if the checksum does not match.
+    """
+    if not verify_checksum(path):
+        return None
+
+    records = []
+    with zipfile.ZipFile(path) as z:
+        for name in z.namelist():
+            with z.open(name) as f:
+                for row in csv.reader(io.TextIOWrapper(f, encoding="utf-8")):
+                    if not row or not row[0].isdigit():
+                        # HEADER
+                        continue
+                    open_time = int(row[0])
+                    close_time = int(row[6])
+                    if open_time >= _MAX_MS_TIMESTAMP:
+                        open_time //= 1000
+                        close_time //= 1000
+                    records.append(
+                        [open_time]
+                        + row[1:6]
+                        + [close_time]
+                        + [row[7], int(row[8])]
+                        + row[9:12]
+                    )
+    return records
+
+
+class Importer:
+    """Importer class."""
+
+    source_name = "BINANCE_ARCHIVE"
+
+    def __init__(self, target_: BaseTarget, interval: str, workers: int) -> None:
+        """Archive importer.
+
+        Args:
+            target_: Target to import into.
+            interval: kline interval.
+            workers: Processes used to verify and parse archives.
+        """
+        self._target = target_
+        self._interval = interval
+        self._workers = workers
+        self._validator = Validator(interval)
+        self._file_pattern = re.compile(
+            rf"^(?P<symbol>[A-Z0-9]+)-{re.escape(interval)}-[0-9-]+\.zip$"
+        )
+
+    def find_archives(self, path: str) -> List[Tuple[str, str]]:
+        """Get (symbol, path) of the archives for the interval under path."""
+        archives = []
+        for root, _, files in os.walk(path):
+            for name in files:
+                match = self._file_pattern.match(name)
+                if match:
+                    archives.append((match["symbol"], os.path.join(root, name)))
+        return sorted(archives)
+
+    def read_archives(
+        self, archives: List[Tuple[str, str]]
+    ) -> Iterator[Tuple[str, str, Optional[List[List]]]]:
+        """Read archives in worker processes, yielding them in order.
+
+        Only two archives per worker are read ahead of the consumer, so parsed
+        klines do not pile up in memory while the target falls behind.
+
+        Args:
+            archives: (symbol, path) of the archives.
+
+        Yields:
+            (symbol, path, raw klines) of every archive.
+        """
+        max_in_flight = 2 * self._workers
+        in_flight: Deque[Tuple[str, str, Future]] = deque()
+        with ProcessPoolExecutor(max_workers=self._workers) as executor:
+            for symbol, archive in archives:
+                if len(in_flight) >= max_in_flight:
+                    done_symbol, done_archive, future = in_flight.popleft()
+                    yield done_symbol, done_archive, future.result()
+                in_flight.append(
+                    (symbol, archive, executor.submit(read_archive, archive))
+                )
+            while in_flight:
+                done_symbol, done_archive, future = in_flight.popleft()
+                yield done_symbol, done_archive, future.result()
+
+    def run(self, path: str) -> None:
+        """Import all archives found under path."""
+        start = time.perf_counter()
+        archives = self.find_archives(path)
+        logger.info(f"Importing {len(archives)} archives...")
+
+        latest: Dict[str, Kline] = {}
+        n_records = 0
+        for symbol, archive, raw_records in self.read_archives(archives):
+            if raw_records is None:
+                logger.warning(f"Checksum missing or invalid, skipping {archive}.")
+                continue
+            raw_records, rejected = self._validator.validate(raw_records)
+            if rejected:
+                self._target.execute(
+                    self._target.queries(self._interval).QUARANTINE,
+                    quarantine_records(symbol, rejected),
+                )
+            if not raw_records:
+                self._target.commit_transaction()
+                continue
+
+            record_ids = self._target.get_next_ids(self._interval, len(raw_records))
+            record_objs = Kline.build_records(record_ids, symbol, raw_records)
+            self._target.execute(
+                self._target.queries(self._interval).APPEND,
+                [record.as_tuple() for record in record_objs],
+            )
+            self._target.commit_transaction()
+            n_records += len(record_objs)
+
+            last = max(record_objs, key=lambda r: r.open_time)
+            if symbol not in latest or last.open_time > latest[symbol].open_time:
+                latest[symbol] = last
+
+        self.hand_off(latest)
+        logger.info(
+            f"Imported klines ({n_records}) for {len(latest)} symbols "
+            f"in {time.perf_counter() - start:.1f}s, "
+            f"validation: {self._validator.report()}."
+        )
+
+    def hand_off(self, latest: Dict[str, Kline]) -> None:
+        """Move latest closed klines forward so the loader requests the tail only.
+
+        Archives lag the exchange, so symbols are checked against the end of
+        the archives rather than the clock: a symbol whose archives stop
+        before the others was delisted and is recorded as inactive.
+
+        Args:
+            latest: last archived kline per symbol.
+        """
+        if not latest:
+            return
+        persisted = {k[0]: k[1] for k in self._target.get_latest(self._interval) or []}
+        end = date_helpers.datetime_to_binance_timestamp(
+            max(kline.open_time for kline in latest.values())
+        )
+        latest_records = [
+            Latest.build_record(
+                [
+                    symbol,
+                    kline.id,
+                    kline.open_time,
+                    date_helpers.check_active(self._interval, kline.open_time, now=end),
+                    self.source_name,
+                ]
+            ).as_tuple()
+            for symbol, kline in latest.items()
+            if symbol not in persisted
+            or persisted[symbol] is None
+            or kline.open_time > persisted[symbol]
+        ]
+        self._target.execute(
+            self._target.queries_latest(self._interval).UPSERT, latest_records
+        )
+        self._target.commit_transaction()
+        for record in latest_records:
+            logger.info(f"{record[0]} imported up to {record[2]}.")
+
+
+def parse_args() -> argparse.Namespace:
+    """Parses user input arguments when starting the import."""
+    parser = argparse.ArgumentParser(prog="python -m binance_spot_loader.importer")
+
+    parser.add_argument(
+        "--target",
+        dest="target",
+        type=str,
+        required=False,
+        default=os.environ.get("TARGET"),
+        help="Postgres connection URL. e.g.: "
+        "user=username password=password "
+        "host=localhost port=5432 dbname=binance, "
+        "or an SQLite file. e.g.: sqlite:///binance.db",
+    )
+
+    parser.add_argument(
+        "--interval",
+        dest="interval",
+        type=str,
+        required=False,
+        default=os.environ.get("INTERVAL", default="1h"),
+        help="Kline interval to import. e.g.: 1h",
+    )
+
+    parser.add_argument(
+        "--archive_dir",
+        dest="archive_dir",
+        type=str,
+        required=False,
+        default=os.environ.get("ARCHIVE_DIR"),
+        help="Directory (or mounted mirror) holding the kline archives.",
+    )
+
+    parser.add_argument(
+        "--workers",
+        dest="workers",
+        type=int,
+        required=False,
+        default=int(os.environ.get("WORKERS", default=os.cpu_count() or 1)),
+        help="Processes used to verify and parse archives.",
+    )
+
+    a = parser.parse_args()
+
+    return a
+
+
+if __name__ == "__main__":
+    configure_logging()
+    parsed_args = parse_args()
+
+    importer = Importer(
+        build_target(parsed_args.target),
+        parsed_args.interval,
+        parsed_args.workers,
+    )
+    importer.run(parsed_args.archive_dir)
@@ -0,0 +1,15 @@
+"""Logging configuration."""
+
+import logging
+import os
+from sys import stdout
+
+
+def configure_logging() -> None:
+    """Configure root logger, called by the entry points only."""
+    logging.basicConfig(
+        level=os.environ.get("LOG_LEVEL", "INFO").upper(),
+        format="%(asctime)s %(levelname)s [%(filename)s:%(lineno)d]: %(message)s",
+        datefmt="%Y-%m-%d %H:%M:%S",
+        stream=stdout,
+    )
@@ -46,6 +46,62 @@ class Kline(BaseModel):
 
         return res
 
+    @classmethod
+    def build_records(
+        cls, ids: List[int], symbol: str, records: List[List]
+    ) -> List["Kline"]:
+        """Build record objects for a whole page of Binance klines."""
+        open_times = date_helpers.binance_timestamps_to_datetimes(
+            record[0] for record in records
+        )
+        close_times = date_helpers.binance_timestamps_to_datetimes(
+            record[6] for record in records
+        )
+
+        res = []
+        for record_id, record, open_time, close_time in zip(
+            ids, records, open_times, close_times
+        ):
+            obj = cls()
+            obj.id = record_id
+            obj.symbol = symbol
+            obj.open_time = open_time
+            obj.open_price = Decimal(record[1])
+            obj.high_price = Decimal(record[2])
+            obj.low_price = Decimal(record[3])
+            obj.close_price = Decimal(record[4])
+            obj.volume = Decimal(record[5])
+            obj.close_time = close_time
+            obj.quote_volume = Decimal(record[7])
+            obj.trades = int(record[8])
+            obj.taker_buy_volume = Decimal(record[9])
+            obj.taker_buy_quote_volume = Decimal(record[10])
+            res.append(obj)
+
+        return res
+
+    @classmethod
+    def from_row(cls, row: Tuple) -> "Kline":
+        """Build record object from a persisted spot_{interval} row."""
+        res = cls()
+        (
+            res.id,
+            res.symbol,
+            res.open_time,
+            res.open_price,
+            res.high_price,
+            res.low_price,
+            res.close_price,
+            res.volume,
+            res.close_time,
+            res.quote_volume,
+            res.trades,
+            res.taker_buy_volume,
+            res.taker_buy_quote_volume,
+        ) = row
+
+        return res
+
     def as_tuple(self) -> Tuple:
         """Get object as tuple."""
         return (
@@ -1,9 +1,34 @@
 """Data source interactions."""
 
+from .base import BaseTarget
 from .source import Source
+from .spool import Spool
+from .sqlite_target import SqliteTarget
 from .target import Target
 
+_SQLITE_PREFIX = "sqlite:///"
+
+
+def build_target(connection_string: str) -> BaseTarget:
+    """Build the target backend for the connection string.
+
+    Args:
+        connection_string: ``sqlite:///path/to/file.db`` for SQLite, a Postgres
+            connection string otherwise.
+
+    Returns:
+        Target backend.
+    """
+    if connection_string.startswith(_SQLITE_PREFIX):
+        return SqliteTarget(connection_string.removeprefix(_SQLITE_PREFIX))
+    return Target(connection_string)
+
+
 __all__ = [
+    "BaseTarget",
+    "build_target",
     "Source",
+    "Spool",
+    "SqliteTarget",
     "Target",
 ]
@@ -0,0 +1,80 @@
+"""Base target."""
+
+from abc import ABC, abstractmethod
+from datetime import datetime
+from typing import Dict, Iterator, List, Optional, Tuple, Type
+
+from binance_spot_loader.queries import BaseQueries, BaseQueriesLatest
+
+
+class BaseTarget(ABC):
+    """Base target, the interface shared by the writer backends.
+
+    Writes go through ``execute`` with the backend's own queries: ``UPSERT`` to
+    insert or update rows and ``APPEND`` to bulk insert skipping existing rows.
+    Nothing is visible to other connections until ``commit_transaction``.
+    """
+
+    # BASE CLASS OF THE ERRORS RAISED BY THE BACKEND DRIVER
+    Error: Type[Exception]
+    # ERRORS CAUSED BY THE WRITTEN VALUES, RETRYING THE SAME WRITE FAILS AGAIN
+    DataError: Tuple[Type[Exception], ...]
+
+    _queries: Dict[str, BaseQueries]
+    _queries_latest: Dict[str, BaseQueriesLatest]
+
+    def queries(self, interval: str) -> BaseQueries:
+        """Get kline queries of the given interval."""
+        return self._queries[interval]
+
+    def queries_latest(self, interval: str) -> BaseQueriesLatest:
+        """Get latest kline queries of the given interval."""
+        return self._queries_latest[interval]
+
+    @abstractmethod
+    def connect(self) -> None:
+        """Connects to data source."""
+
+    @abstractmethod
+    def commit_transaction(self) -> None:
+        """Commits a transaction."""
+
+    @abstractmethod
+    def rollback_transaction(self) -> None:
+        """Rolls back a transaction."""
+
+    @abstractmethod
+    def get_latest(self, interval: str) -> Optional[List[Tuple]]:
+        """Get (symbol, latest_close, active) for the available symbols."""
+
+    @abstractmethod
+    def get_inactive_symbols(self, interval: str) -> Optional[List[str]]:
+        """Get symbols flagged as inactive."""
+
+    @abstractmethod
+    def get_activity(
+        self, interval: str, since: datetime
+    ) -> Optional[List[Tuple[str, int, float, float]]]:
+        """Get trades, quote volume and volume per symbol since the open time."""
+
+    @abstractmethod
+    def stream_klines(
+        self, interval: str, exported: Dict[str, datetime], itersize: int = 10_000
+    ) -> Iterator[Tuple]:
+        """Stream closed klines not exported yet, ordered by symbol and open time."""
+
+    @abstractmethod
+    def get_recent_klines(self, interval: str, symbol: str, n: int) -> List[Tuple]:
+        """Get the last n closed klines of the symbol, ordered by open time."""
+
+    @abstractmethod
+    def get_next_id(self, interval: str) -> Optional[int]:
+        """Get next id for the given interval."""
+
+    @abstractmethod
+    def get_next_ids(self, interval: str, n: int) -> List[int]:
+        """Get the next n ids for the given interval."""
+
+    @abstractmethod
+    def execute(self, instruction: str, records: List[Tuple]) -> None:
+        """Execute instruction for all records."""
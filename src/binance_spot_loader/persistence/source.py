@@ -3,19 +3,12 @@
 import hashlib
 import hmac
 import logging
-import os
-from sys import stdout
-import time
 from typing import Dict, List, Optional, Tuple
 
 import requests
 
-logging.basicConfig(
-    level=os.environ.get("LOG_LEVEL", "INFO").upper(),
-    format="%(asctime)s %(levelname)s [%(filename)s:%(lineno)d]: %(message)s",
-    datefmt="%Y-%m-%d %H:%M:%S",
-    stream=stdout,
-)
+from binance_spot_loader.clock import Clock
+
 logger = logging.getLogger(__name__)
 
 
@@ -30,6 +23,8 @@ class Source:
     _session: requests.Session
 
     mkt_cap_filter: int = 5_000_000
+    # SECONDS, A HUNG REQUEST WOULD OTHERWISE BLOCK SHUTDOWN FOREVER
+    request_timeout: float = 30
 
     def __init__(self, connection_string: str, interval: str) -> None:
         credentials = dict(kv.split("=") for kv in connection_string.split(" "))
@@ -38,6 +33,7 @@ class Source:
         self._secret_key = credentials["SECRET_KEY"]
 
         self.interval = interval
+        self.clock = Clock(self.get_server_time)
 
     def connect(self) -> None:
         """Connect to the Binance Rest API."""
@@ -49,24 +45,33 @@ class Source:
         }
         self._session.headers.update(self._headers)
 
-        self.ping()
-
     def ping(self) -> None:
         """Ping Binance Rest API."""
         url = f"{self.base_url}ping"
-        response = self._session.get(url)
+        response = self._session.get(url, timeout=self.request_timeout)
 
         if response.status_code == 200:
             logger.info("Connected to the Binance API.")
         else:
             logger.info(f"Connection failed with status code {response.status_code}")
 
+    def get_server_time(self) -> Optional[int]:
+        """Get Binance server time (ms)."""
+        url = f"{self.base_url}time"
+        response = self._session.get(url, timeout=self.request_timeout)
+
+        if response.status_code == 200:
+            return response.json()["serverTime"]
+        else:
+            logger.warning(f"Request failed with status code {response.status_code}")
+            return None
+
     def get_symbols(
         self, quote_symbols: Optional[Dict[str, int]]
     ) -> Optional[List[str]]:
         """Gets all symbols quoted in the provided currencies (and their lenght)."""
         url = f"{self.base_url}exchangeInfo"
-        response = self._session.get(url)
+        response = self._session.get(url, timeout=self.request_timeout)
 
         if response.status_code == 200:
             symbols = []
@@ -90,7 +95,7 @@ class Source:
     ) -> Optional[List[Tuple[str, str]]]:
         """Get trading status of the provided symbols."""
         url = f"{self.base_url}exchangeInfo"
-        response = self._session.get(url)
+        response = self._session.get(url, timeout=self.request_timeout)
 
         if response.status_code == 200:
             symbol_status = []
@@ -133,18 +138,19 @@ class Source:
         else:
             params = {"symbol": symbol, "interval": interval, "limit": limit}
 
-        timestamp = str(int(time.time() * 1000))
+        timestamp = str(self.clock.now_ms())
         query_string = "&".join([f"{k}={v}" for k, v in params.items()])
         signature = hmac.new(
             self._secret_key.encode("utf-8"),
             f"{query_string}&timestamp={timestamp}".encode("utf-8"),
             hashlib.sha256,
         ).hexdigest()
-        self._headers["X-MBX-TIMESTAMP"] = timestamp
-        self._headers["X-MBX-SIGNATURE"] = signature
-        self._session.headers.update(self._headers)
+        # PER REQUEST HEADERS, THE SESSION IS SHARED ACROSS THREADS
+        headers = {"X-MBX-TIMESTAMP": timestamp, "X-MBX-SIGNATURE": signature}
 
-        response = self._session.get(url, params=params)
+        response = self._session.get(
+            url, params=params, headers=headers, timeout=self.request_timeout
+        )
 
         if response.status_code == 200:
             # Print the response data
@@ -162,7 +168,7 @@ class Source:
             symbol=symbol,
             interval=self.interval,
             start_time=0,
-            end_time=int(time.time() * 1000),
+            end_time=self.clock.now_ms(),
             limit=1,
         )
         return kline[0][0] if kline else None
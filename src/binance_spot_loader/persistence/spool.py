@@ -0,0 +1,153 @@
+"""Spool."""
+
+import json
+import logging
+import os
+import struct
+from typing import Iterator, List, Optional, Tuple
+import zlib
+
+logger = logging.getLogger(__name__)
+
+
+class Spool:
+    """Local write-ahead spool of fetched kline pages.
+
+    Pages are appended to a segment file as length and CRC prefixed, compressed
+    frames. Sealed segments are immutable and are removed once persisted, so a
+    restart replays whatever was fetched but not yet committed to the target.
+    """
+
+    _header = struct.Struct("<II")
+    _open_suffix = ".open"
+    _sealed_suffix = ".seg"
+    _rejected_dir = "rejected"
+
+    def __init__(self, path: str) -> None:
+        """Spool stored in the given directory.
+
+        Args:
+            path: Directory holding the segment files.
+        """
+        self._path = path
+        os.makedirs(self._path, exist_ok=True)
+        self._file = None
+        self._n_pages = 0
+
+        # SEGMENTS LEFT OPEN BY A CRASH ARE SEALED AS THEY ARE, A TORN LAST
+        # FRAME IS DETECTED AND SKIPPED ON READ
+        for name in sorted(os.listdir(self._path)):
+            if name.endswith(self._open_suffix):
+                self._seal_file(os.path.join(self._path, name))
+
+        # REJECTED SEGMENTS KEEP THEIR NAMES, SO THEY COUNT TOO
+        seqs = [
+            int(name.split(".")[0])
+            for name in self._names() + self._names(self._rejected_path)
+        ]
+        self._seq = max(seqs) + 1 if seqs else 0
+
+    @property
+    def _rejected_path(self) -> str:
+        return os.path.join(self._path, self._rejected_dir)
+
+    def _names(self, path: Optional[str] = None) -> List[str]:
+        path = path or self._path
+        if not os.path.isdir(path):
+            return []
+        return sorted(
+            name for name in os.listdir(path) if name.endswith(self._sealed_suffix)
+        )
+
+    def _seal_file(self, open_path: str) -> None:
+        os.replace(
+            open_path, open_path[: -len(self._open_suffix)] + self._sealed_suffix
+        )
+        dir_fd = os.open(self._path, os.O_RDONLY)
+        try:
+            os.fsync(dir_fd)
+        finally:
+            os.close(dir_fd)
+
+    @property
+    def _open_path(self) -> str:
+        return os.path.join(self._path, f"{self._seq:012d}{self._open_suffix}")
+
+    def append(self, symbol: str, records: List[List]) -> None:
+        """Append a page of raw klines to the open segment."""
+        if self._file is None:
+            self._file = open(self._open_path, "ab")
+        payload = zlib.compress(
+            json.dumps([symbol, records], separators=(",", ":")).encode("utf-8"), 1
+        )
+        self._file.write(self._header.pack(len(payload), zlib.crc32(payload)))
+        self._file.write(payload)
+        self._file.flush()
+        self._n_pages += 1
+
+    def seal(self) -> Optional[str]:
+        """Seal the open segment, making it available for draining."""
+        if self._file is None:
+            return None
+        os.fsync(self._file.fileno())
+        self._file.close()
+        self._file = None
+        self._seal_file(self._open_path)
+        logger.debug(f"Sealed spool segment {self._seq} ({self._n_pages} pages).")
+
+        path = os.path.join(self._path, f"{self._seq:012d}{self._sealed_suffix}")
+        self._seq += 1
+        self._n_pages = 0
+        return path
+
+    def segments(self) -> List[str]:
+        """Get sealed segments, oldest first."""
+        return [os.path.join(self._path, name) for name in self._names()]
+
+    def read(self, segment: str) -> Iterator[Tuple[str, List[List]]]:
+        """Read (symbol, raw klines) pages from a sealed segment."""
+        with open(segment, "rb") as f:
+            while True:
+                header = f.read(self._header.size)
+                if not header:
+                    return
+                if len(header) < self._header.size:
+                    logger.warning(f"Truncated frame at the end of {segment}.")
+                    return
+                length, crc = self._header.unpack(header)
+                payload = f.read(length)
+                if len(payload) < length or zlib.crc32(payload) != crc:
+                    logger.warning(f"Corrupt frame at the end of {segment}.")
+                    return
+                symbol, records = json.loads(zlib.decompress(payload))
+                yield symbol, records
+
+    def remove(self, segment: str) -> None:
+        """Remove a persisted segment."""
+        os.remove(segment)
+
+    def reject(self, segment: str) -> str:
+        """Move a segment that can not be persisted out of the spool.
+
+        Rejected segments are kept for inspection, moving one back into the
+        spool directory replays it. A rejected segment is never overwritten.
+
+        Args:
+            segment: sealed spool segment.
+
+        Returns:
+            New path of the segment.
+        """
+        os.makedirs(self._rejected_path, exist_ok=True)
+        name = os.path.basename(segment)[: -len(self._sealed_suffix)]
+        path = os.path.join(self._rejected_path, name + self._sealed_suffix)
+        i = 1
+        while os.path.exists(path):
+            path = os.path.join(self._rejected_path, f"{name}.{i}{self._sealed_suffix}")
+            i += 1
+        os.replace(segment, path)
+        return path
+
+    def close(self) -> None:
+        """Seal any open segment."""
+        self.seal()
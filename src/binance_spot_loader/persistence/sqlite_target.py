@@ -0,0 +1,240 @@
+"""SQLite target."""
+
+from datetime import datetime
+from decimal import Decimal
+import logging
+import sqlite3
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from binance_spot_loader.persistence.base import BaseTarget
+import binance_spot_loader.queries as queries
+
+logger = logging.getLogger(__name__)
+
+# FIXED WIDTH SO TIMESTAMPS STORED AS TEXT COMPARE IN ORDER
+_TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S.%f"
+
+
+def _adapt(value: Any) -> Any:
+    """Adapt value to a type SQLite stores without losing precision."""
+    if isinstance(value, datetime):
+        return value.strftime(_TIMESTAMP_FORMAT)
+    if isinstance(value, Decimal):
+        return str(value)
+    if isinstance(value, bool):
+        return int(value)
+    return value
+
+
+def _kline_row(r: Tuple) -> Tuple:
+    """Convert a stored spot_{interval} row back to Python types."""
+    return (
+        r[0],
+        r[1],
+        datetime.strptime(r[2], _TIMESTAMP_FORMAT),
+        Decimal(r[3]),
+        Decimal(r[4]),
+        Decimal(r[5]),
+        Decimal(r[6]),
+        Decimal(r[7]),
+        datetime.strptime(r[8], _TIMESTAMP_FORMAT),
+        Decimal(r[9]),
+        r[10],
+        Decimal(r[11]),
+        Decimal(r[12]),
+    )
+
+
+class SqliteTarget(BaseTarget):
+    """Embedded SQLite target, for edge boxes and local runs."""
+
+    Error = sqlite3.Error
+    DataError = (sqlite3.DataError, sqlite3.IntegrityError)
+
+    _queries: Dict[str, queries.BaseQueries] = {"1h": queries.SqliteSpot1hQueries()}
+
+    _queries_latest: Dict[str, queries.BaseQueriesLatest] = {
+        "1h": queries.SqliteSpot1hLatestQueries()
+    }
+
+    _schema = (
+        queries.SqliteSpot1hQueries.CREATE,
+        queries.SqliteSpot1hLatestQueries.CREATE,
+    )
+
+    def __init__(self, path: str) -> None:
+        """Embedded SQLite database file, connected and created on first use.
+
+        Args:
+            path: Database file.
+        """
+        self._path = path
+        self._connection: Optional[sqlite3.Connection] = None
+
+    def connect(self) -> None:
+        """Connects to data source."""
+        version = self.connection.execute("SELECT sqlite_version();").fetchone()[0]
+        logger.info(
+            f"{self.__class__.__name__} connected to: {self._path} ({version})."
+        )
+
+    @property
+    def connection(self) -> sqlite3.Connection:
+        """Gets connection, creating the tables if needed."""
+        if self._connection is None:
+            # CALLERS SHARING A TARGET ACROSS THREADS SERIALIZE ITS USE
+            self._connection = sqlite3.connect(
+                self._path, timeout=30, check_same_thread=False
+            )
+            # CONCURRENT READERS WHILE THE DRAINER WRITES
+            self._connection.execute("PRAGMA journal_mode=WAL;")
+            for script in self._schema:
+                self._connection.executescript(script)
+
+        return self._connection
+
+    def commit_transaction(self) -> None:
+        """Commits a transaction."""
+        self.connection.commit()
+
+    def rollback_transaction(self) -> None:
+        """Rolls back a transaction."""
+        if self._connection is not None:
+            self._connection.rollback()
+
+    def get_latest(self, interval: str) -> Optional[List[Tuple]]:
+        """Get latest persisted open time for the available symbols."""
+        query = (
+            "SELECT symbol, latest_close, active "  # noqa: S608
+            "FROM spot_{interval}_latest;"
+        ).format(interval=interval)
+        res = self.connection.execute(query).fetchall()
+
+        return (
+            [
+                (
+                    r[0],
+                    datetime.strptime(r[1], _TIMESTAMP_FORMAT) if r[1] else None,
+                    bool(r[2]),
+                )
+                for r in res
+            ]
+            if res
+            else None
+        )
+
+    def get_inactive_symbols(self, interval: str) -> Optional[List[str]]:
+        """Get latest persisted open time for the available symbols."""
+        query = (
+            "SELECT symbol "  # noqa: S608
+            "FROM spot_{interval}_latest "
+            "WHERE active = 0;"
+        ).format(interval=interval)
+        res = self.connection.execute(query).fetchall()
+
+        return [s[0] for s in res] if res else None
+
+    def get_activity(
+        self, interval: str, since: datetime
+    ) -> Optional[List[Tuple[str, int, float, float]]]:
+        """Get trades, quote volume and volume per symbol since the open time."""
+        query = (
+            "SELECT symbol, SUM(trades), "  # noqa: S608
+            "   SUM(CAST(quote_volume AS REAL)), SUM(CAST(volume AS REAL)) "
+            "FROM spot_{interval} "
+            "WHERE open_time >= ? "
+            "GROUP BY symbol;"
+        ).format(interval=interval)
+        res = self.connection.execute(query, (_adapt(since),)).fetchall()
+
+        return (
+            [(s[0], int(s[1] or 0), float(s[2] or 0), float(s[3] or 0)) for s in res]
+            if res
+            else None
+        )
+
+    def stream_klines(
+        self, interval: str, exported: Dict[str, datetime], itersize: int = 10_000
+    ) -> Iterator[Tuple]:
+        """Stream closed klines not exported yet, ordered by symbol and open time.
+
+        Args:
+            interval: kline interval.
+            exported: Latest exported open time per symbol.
+            itersize: Rows fetched at a time.
+
+        Yields:
+            spot_{interval} rows.
+        """
+        connection = self.connection
+        connection.execute("DROP TABLE IF EXISTS temp.exported;")
+        connection.execute("CREATE TEMP TABLE exported (symbol TEXT, exported TEXT);")
+        connection.executemany(
+            "INSERT INTO temp.exported VALUES (?, ?);",
+            [(k, _adapt(v)) for k, v in exported.items()],
+        )
+        query = (
+            "SELECT s.id, s.symbol, s.open_time, s.open_price, "  # noqa: S608
+            "   s.high_price, s.low_price, s.close_price, s.volume, "
+            "   s.close_time, s.quote_volume, s.trades, "
+            "   s.taker_buy_volume, s.taker_buy_quote_volume "
+            "FROM spot_{interval} s "
+            "JOIN spot_{interval}_latest l ON l.symbol = s.symbol "
+            "LEFT JOIN temp.exported w ON w.symbol = s.symbol "
+            "WHERE s.open_time <= l.latest_close "
+            "   AND (w.exported IS NULL OR s.open_time > w.exported) "
+            "ORDER BY s.symbol, s.open_time;"
+        ).format(interval=interval)
+        cursor = connection.execute(query)
+        while True:
+            rows = cursor.fetchmany(itersize)
+            if not rows:
+                break
+            for r in rows:
+                yield _kline_row(r)
+        connection.rollback()
+
+    def get_recent_klines(self, interval: str, symbol: str, n: int) -> List[Tuple]:
+        """Get the last n closed klines of the symbol, ordered by open time."""
+        query = (
+            "SELECT s.id, s.symbol, s.open_time, s.open_price, "  # noqa: S608
+            "   s.high_price, s.low_price, s.close_price, s.volume, "
+            "   s.close_time, s.quote_volume, s.trades, "
+            "   s.taker_buy_volume, s.taker_buy_quote_volume "
+            "FROM spot_{interval} s "
+            "JOIN spot_{interval}_latest l ON l.symbol = s.symbol "
+            "WHERE s.symbol = ? AND s.open_time <= l.latest_close "
+            "ORDER BY s.open_time DESC "
+            "LIMIT ?;"
+        ).format(interval=interval)
+        res = self.connection.execute(query, (symbol, n)).fetchall()
+
+        return [_kline_row(r) for r in reversed(res)]
+
+    def get_next_id(self, interval: str) -> Optional[int]:
+        """Get next id for the given interval."""
+        return self.get_next_ids(interval, 1)[0]
+
+    def get_next_ids(self, interval: str, n: int) -> List[int]:
+        """Get the next n ids for the given interval."""
+        if n <= 0:
+            return []
+        query = (
+            "UPDATE spot_{interval}_id_seq "  # noqa: S608
+            "SET value = value + ? RETURNING value;"
+        ).format(interval=interval)
+        last = self.connection.execute(query, (n,)).fetchone()[0]
+
+        return list(range(last - n + 1, last + 1))
+
+    def execute(self, instruction: str, records: List[Tuple]) -> None:
+        """Execute instruction for all records.
+
+        Args:
+            instruction: sql query.
+            records: records to persist.
+        """
+        if records:
+            self.connection.executemany(
+                instruction, [tuple(_adapt(v) for v in record) for record in records]
+            )
@@ -1,26 +1,42 @@
 """Target."""
 
+from datetime import datetime
 import logging
-from typing import List, Optional, Tuple
+from typing import Dict, Iterator, List, Optional, Tuple
 
 import psycopg2
 import psycopg2.extensions
 from psycopg2.extras import execute_values
 
+from binance_spot_loader.persistence.base import BaseTarget
+import binance_spot_loader.queries as queries
+
 logger = logging.getLogger(__name__)
 
 
-class Target:
+class Target(BaseTarget):
     """Target class."""
 
+    Error = psycopg2.Error
+    DataError = (psycopg2.DataError, psycopg2.IntegrityError)
+
+    _queries: Dict[str, queries.BaseQueries] = {"1h": queries.Spot1hQueries()}
+
+    _queries_latest: Dict[str, queries.BaseQueriesLatest] = {
+        "1h": queries.Spot1hLatestQueries()
+    }
+
+    # TABLES ADDED AFTER THE SCHEMA WAS FIRST DEPLOYED
+    _migrations = (queries.Spot1hQueries.CREATE_QUARANTINE,)
+
     def __init__(self, connection_string: str) -> None:
-        """Postgres' data source.
+        """Postgres' data source, connected on first use.
 
         Args:
             connection_string: Definitions to connect with data source.
         """
-        self._connection = psycopg2.connect(dsn=connection_string)
-        self._connection.autocommit = False
+        self._connection_string = connection_string
+        self._connection: Optional[psycopg2.extensions.connection] = None
         self._tx_cursor = None
 
     def connect(self) -> None:
@@ -40,19 +56,47 @@ class Target:
         ping = cursor.fetchone()
         return ping[0] if ping else None
 
+    @property
+    def connection(self) -> psycopg2.extensions.connection:
+        """Gets connection, (re)connecting if needed."""
+        if self._connection is None or self._connection.closed:
+            if self._connection is not None:
+                logger.info(f"{self.__class__.__name__} reconnecting...")
+            self._connection = psycopg2.connect(dsn=self._connection_string)
+            self._connection.autocommit = False
+            self._migrate(self._connection)
+
+        return self._connection
+
+    def _migrate(self, connection: psycopg2.extensions.connection) -> None:
+        try:
+            with connection.cursor() as cursor:
+                for statement in self._migrations:
+                    cursor.execute(statement)
+            connection.commit()
+        except psycopg2.Error as e:
+            # E.G. NO CREATE PRIVILEGE, THE README LISTS THE MIGRATIONS
+            logger.warning(f"Could not create missing tables: {e}")
+            connection.rollback()
+
     @property
     def cursor(self) -> psycopg2.extensions.cursor:
         """Gets cursor."""
         if self._tx_cursor is not None:
             cursor = self._tx_cursor
         else:
-            cursor = self._connection.cursor()
+            cursor = self.connection.cursor()
 
         return cursor
 
     def commit_transaction(self) -> None:
         """Commits a transaction."""
-        self._connection.commit()
+        self.connection.commit()
+
+    def rollback_transaction(self) -> None:
+        """Rolls back a transaction."""
+        if self._connection is not None and not self._connection.closed:
+            self._connection.rollback()
 
     def get_latest(self, interval: str) -> Optional[List[Tuple]]:
         """Get latest persisted open time for the available symbols."""
@@ -79,6 +123,79 @@ class Target:
 
         return [s[0] for s in res] if res else None
 
+    def get_activity(
+        self, interval: str, since: datetime
+    ) -> Optional[List[Tuple[str, int, float, float]]]:
+        """Get trades, quote volume and volume per symbol since the open time."""
+        cursor = self.cursor
+        query = (
+            "SELECT symbol, SUM(trades), SUM(quote_volume), SUM(volume) "  # noqa: S608
+            "FROM spot_{interval} "
+            "WHERE open_time >= %s "
+            "GROUP BY symbol;"
+        ).format(interval=interval)
+        cursor.execute(query, (since,))
+        res = cursor.fetchall()
+
+        return (
+            [(s[0], int(s[1] or 0), float(s[2] or 0), float(s[3] or 0)) for s in res]
+            if res
+            else None
+        )
+
+    def stream_klines(
+        self, interval: str, exported: Dict[str, datetime], itersize: int = 10_000
+    ) -> Iterator[Tuple]:
+        """Stream closed klines not exported yet, ordered by symbol and open time.
+
+        Args:
+            interval: kline interval.
+            exported: Latest exported open time per symbol.
+            itersize: Rows fetched per round trip by the server-side cursor.
+
+        Yields:
+            spot_{interval} rows.
+        """
+        query = (
+            "SELECT s.id, s.symbol, s.open_time, s.open_price, "  # noqa: S608
+            "   s.high_price, s.low_price, s.close_price, s.volume, "
+            "   s.close_time, s.quote_volume, s.trades, "
+            "   s.taker_buy_volume, s.taker_buy_quote_volume "
+            "FROM spot_{interval} s "
+            "JOIN spot_{interval}_latest l ON l.symbol = s.symbol "
+            "LEFT JOIN UNNEST(%s::VARCHAR[], %s::TIMESTAMP[]) AS w(symbol, exported) "
+            "   ON w.symbol = s.symbol "
+            "WHERE s.open_time <= l.latest_close "
+            "   AND (w.exported IS NULL OR s.open_time > w.exported) "
+            "ORDER BY s.symbol, s.open_time;"
+        ).format(interval=interval)
+        cursor = self.connection.cursor(name=f"stream_spot_{interval}")
+        cursor.itersize = itersize
+        try:
+            cursor.execute(query, (list(exported.keys()), list(exported.values())))
+            yield from cursor
+        finally:
+            cursor.close()
+
+    def get_recent_klines(self, interval: str, symbol: str, n: int) -> List[Tuple]:
+        """Get the last n closed klines of the symbol, ordered by open time."""
+        cursor = self.cursor
+        query = (
+            "SELECT s.id, s.symbol, s.open_time, s.open_price, "  # noqa: S608
+            "   s.high_price, s.low_price, s.close_price, s.volume, "
+            "   s.close_time, s.quote_volume, s.trades, "
+            "   s.taker_buy_volume, s.taker_buy_quote_volume "
+            "FROM spot_{interval} s "
+            "JOIN spot_{interval}_latest l ON l.symbol = s.symbol "
+            "WHERE s.symbol = %s AND s.open_time <= l.latest_close "
+            "ORDER BY s.open_time DESC "
+            "LIMIT %s;"
+        ).format(interval=interval)
+        cursor.execute(query, (symbol, n))
+        res = cursor.fetchall()
+
+        return res[::-1]
+
     def get_next_id(self, interval: str) -> Optional[int]:
         """Get next id for the given interval."""
         cursor = self.cursor
@@ -88,6 +205,18 @@ class Target:
 
         return res[0] if res else None
 
+    def get_next_ids(self, interval: str, n: int) -> List[int]:
+        """Get the next n ids for the given interval."""
+        cursor = self.cursor
+        query = (
+            "SELECT NEXTVAL('spot_{interval}_id_seq') "  # noqa: S608
+            "FROM generate_series(1, %s);"
+        ).format(interval=interval)
+        cursor.execute(query, (n,))
+        res = cursor.fetchall()
+
+        return [r[0] for r in res]
+
     def execute(self, instruction: str, records: List[Tuple]) -> None:
         """Execute values.
 
@@ -3,11 +3,14 @@
 from .base import BaseQueries, BaseQueriesLatest
 from .spot_1h import Queries as Spot1hQueries
 from .spot_1h_latest import Queries as Spot1hLatestQueries
-
+from .sqlite_spot_1h import Queries as SqliteSpot1hQueries
+from .sqlite_spot_1h_latest import Queries as SqliteSpot1hLatestQueries
 
 __all__ = [
     "BaseQueries",
     "BaseQueriesLatest",
     "Spot1hQueries",
     "Spot1hLatestQueries",
+    "SqliteSpot1hQueries",
+    "SqliteSpot1hLatestQueries",
 ]
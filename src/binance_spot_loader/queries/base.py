@@ -5,6 +5,10 @@ class BaseQueries:
     """Base queries."""
 
     UPSERT: str
+    # INSERT SKIPPING EXISTING ROWS, FOR BULK LOADS
+    APPEND: str
+    # ROWS REJECTED BY VALIDATION
+    QUARANTINE: str
 
 
 class BaseQueriesLatest:
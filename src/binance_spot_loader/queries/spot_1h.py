@@ -37,3 +37,41 @@ class Queries(BaseQueries):
         "    taker_buy_volume=EXCLUDED.taker_buy_volume,"
         "    taker_buy_quote_volume=EXCLUDED.taker_buy_quote_volume;"
     )
+
+    APPEND = (
+        "INSERT INTO spot_1h ("
+        "   id, "
+        "   symbol, "
+        "   open_time, "
+        "   open_price, "
+        "   high_price, "
+        "   low_price, "
+        "   close_price, "
+        "   volume, "
+        "   close_time, "
+        "   quote_volume, "
+        "   trades, "
+        "   taker_buy_volume, "
+        "   taker_buy_quote_volume "
+        ") VALUES %s "
+        "ON CONFLICT (symbol, open_time) DO NOTHING;"
+    )
+
+    CREATE_QUARANTINE = (
+        "CREATE TABLE IF NOT EXISTS spot_1h_quarantine ("
+        "   symbol VARCHAR(20) NOT NULL, "
+        "   open_time TIMESTAMP, "
+        "   record TEXT NOT NULL, "
+        "   reasons VARCHAR(200) NOT NULL, "
+        "   quarantined_at TIMESTAMP NOT NULL DEFAULT (NOW() AT TIME ZONE 'UTC')"
+        ");"
+    )
+
+    QUARANTINE = (
+        "INSERT INTO spot_1h_quarantine ("
+        "   symbol, "
+        "   open_time, "
+        "   record, "
+        "   reasons "
+        ") VALUES %s;"
+    )
@@ -0,0 +1,94 @@
+"""SQLite Spot 1h queries."""
+
+from binance_spot_loader.queries.base import BaseQueries
+
+
+class Queries(BaseQueries):
+    """SQLite Spot 1h queries."""
+
+    CREATE = (
+        "CREATE TABLE IF NOT EXISTS spot_1h ("
+        "   id INTEGER PRIMARY KEY, "
+        "   symbol TEXT NOT NULL, "
+        "   open_time TEXT NOT NULL, "
+        "   open_price TEXT, "
+        "   high_price TEXT, "
+        "   low_price TEXT, "
+        "   close_price TEXT, "
+        "   volume TEXT, "
+        "   close_time TEXT, "
+        "   quote_volume TEXT, "
+        "   trades INTEGER, "
+        "   taker_buy_volume TEXT, "
+        "   taker_buy_quote_volume TEXT, "
+        "   UNIQUE (symbol, open_time)"
+        ");"
+        "CREATE INDEX IF NOT EXISTS spot_1h_open_time_idx ON spot_1h (open_time);"
+        "CREATE TABLE IF NOT EXISTS spot_1h_id_seq (value INTEGER NOT NULL);"
+        "INSERT INTO spot_1h_id_seq (value) "
+        "SELECT 0 WHERE NOT EXISTS (SELECT 1 FROM spot_1h_id_seq);"
+        "CREATE TABLE IF NOT EXISTS spot_1h_quarantine ("
+        "   symbol TEXT NOT NULL, "
+        "   open_time TEXT, "
+        "   record TEXT NOT NULL, "
+        "   reasons TEXT NOT NULL, "
+        "   quarantined_at TEXT NOT NULL DEFAULT CURRENT_TIMESTAMP"
+        ");"
+    )
+
+    UPSERT = (
+        "INSERT INTO spot_1h ("
+        "   id, "
+        "   symbol, "
+        "   open_time, "
+        "   open_price, "
+        "   high_price, "
+        "   low_price, "
+        "   close_price, "
+        "   volume, "
+        "   close_time, "
+        "   quote_volume, "
+        "   trades, "
+        "   taker_buy_volume, "
+        "   taker_buy_quote_volume "
+        ") VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+        "ON CONFLICT (symbol, open_time) DO "
+        "UPDATE SET "
+        "    open_price=excluded.open_price,"
+        "    high_price=excluded.high_price,"
+        "    low_price=excluded.low_price,"
+        "    close_price=excluded.close_price,"
+        "    volume=excluded.volume,"
+        "    close_time=excluded.close_time,"
+        "    quote_volume=excluded.quote_volume,"
+        "    trades=excluded.trades,"
+        "    taker_buy_volume=excluded.taker_buy_volume,"
+        "    taker_buy_quote_volume=excluded.taker_buy_quote_volume;"
+    )
+
+    APPEND = (
+        "INSERT OR IGNORE INTO spot_1h ("
+        "   id, "
+        "   symbol, "
+        "   open_time, "
+        "   open_price, "
+        "   high_price, "
+        "   low_price, "
+        "   close_price, "
+        "   volume, "
+        "   close_time, "
+        "   quote_volume, "
+        "   trades, "
+        "   taker_buy_volume, "
+        "   taker_buy_quote_volume "
+        ") VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?);"
+    )
+
+    QUARANTINE = (
+        "INSERT INTO spot_1h_quarantine ("
+        "   symbol, "
+        "   open_time, "
+        "   record, "
+        "   reasons "
+        ") VALUES (?, ?, ?, ?);"
+    )
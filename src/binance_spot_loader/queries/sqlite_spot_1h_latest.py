@@ -0,0 +1,35 @@
+"""SQLite Latest Spot queries."""
+
+from binance_spot_loader.queries.base import BaseQueriesLatest
+
+
+class Queries(BaseQueriesLatest):
+    """SQLite Latest Spot queries."""
+
+    CREATE = (
+        "CREATE TABLE IF NOT EXISTS spot_1h_latest ("
+        "   symbol TEXT PRIMARY KEY, "
+        "   id INTEGER, "
+        "   latest_close TEXT, "
+        "   active INTEGER, "
+        "   source TEXT"
+        ");"
+    )
+
+    UPSERT = (
+        "INSERT INTO spot_1h_latest("
+        "   symbol, "
+        "   id, "
+        "   latest_close, "
+        "   active, "
+        "   source "
+        ") VALUES (?, ?, ?, ?, ?) "
+        "ON CONFLICT (symbol) DO "
+        "UPDATE SET "
+        "    id=excluded.id, "
+        "    latest_close=excluded.latest_close, "
+        "    active=excluded.active, "
+        "    source=excluded.source;"
+    )
+
+    CORRECT_TRADING_STATUS = "UPDATE spot_1h_latest SET active = ?2 WHERE symbol = ?1;"
@@ -0,0 +1,175 @@
+"""Polling scheduler."""
+
+import logging
+import math
+from typing import Dict, List, Optional, Set, Tuple
+
+import binance_spot_loader.date_helpers as date_helpers
+
+logger = logging.getLogger(__name__)
+
+
+class Scheduler:
+    """Per-symbol polling schedule based on recent trading activity.
+
+    Symbols are ranked by the quote volume of their recent klines against the
+    other symbols of the same quote asset, since volumes in different quote
+    assets do not compare. The most active share of each quote asset is polled
+    every cycle and first, as long as its quote volume, converted to the
+    reference quote, reaches the floor. Other symbols with trades are polled
+    once per interval and idle symbols every few intervals. Skipped symbols
+    catch up in a single request on their next poll.
+    """
+
+    HIGH = 0
+    LOW = 1
+    IDLE = 2
+
+    max_limit = 1000
+    # QUOTE ASSET THE VOLUME FLOOR IS EXPRESSED IN
+    reference_quote = "USDT"
+
+    def __init__(
+        self,
+        interval: str,
+        quote_symbols: List[str],
+        quote_volume_floor: float = 0,
+        high_share: float = 0.25,
+        lookback_intervals: int = 24,
+        idle_intervals: int = 6,
+    ) -> None:
+        """Polling scheduler.
+
+        Args:
+            interval: Binance interval.
+            quote_symbols: Quote assets the symbols are ranked within.
+            quote_volume_floor: Quote volume over the lookback, in the reference
+                quote, below which a symbol is never polled every cycle. Not
+                applied to quote assets without a pair in the reference quote.
+            high_share: Share of each quote asset's symbols polled every cycle.
+            lookback_intervals: Number of klines used to measure activity.
+            idle_intervals: Intervals between polls of symbols without trades.
+        """
+        self._interval = interval
+        self._interval_ms = date_helpers.interval_to_milliseconds(interval)
+        # LONGEST FIRST SO E.G. TUSD IS NOT TAKEN FOR USD
+        self._quote_symbols = sorted(quote_symbols, key=len, reverse=True)
+        self._quote_volume_floor = quote_volume_floor
+        self._high_share = high_share
+        self._lookback_intervals = lookback_intervals
+
+        self._every_ms = {
+            self.HIGH: 0,
+            self.LOW: self._interval_ms,
+            self.IDLE: idle_intervals * self._interval_ms,
+        }
+
+        self._activity: Dict[str, Tuple[int, float, float]] = {}
+        self._rank: Dict[str, float] = {}
+        self._high: Set[str] = set()
+        self._last_polled: Dict[str, int] = {}
+        self._refreshed_ms: Optional[int] = None
+
+    def needs_refresh(self, now: int) -> bool:
+        """Whether activity should be reloaded (once per interval)."""
+        return (
+            self._refreshed_ms is None or now - self._refreshed_ms >= self._interval_ms
+        )
+
+    def lookback_start(self, now: int) -> int:
+        """Earliest open time (ms) considered for activity."""
+        return now - self._lookback_intervals * self._interval_ms
+
+    def update(
+        self, activity: Optional[List[Tuple[str, int, float, float]]], now: int
+    ) -> None:
+        """Set activity as (symbol, trades, quote volume, volume) over the lookback."""
+        self._activity = (
+            {a[0]: (a[1], a[2], a[3]) for a in activity} if activity else {}
+        )
+        self._refreshed_ms = now
+
+        rates = self.quote_rates()
+        by_quote: Dict[str, List[Tuple[float, str]]] = {}
+        for symbol, (trades, quote_volume, _) in self._activity.items():
+            if trades > 0:
+                by_quote.setdefault(self.quote_of(symbol), []).append(
+                    (quote_volume, symbol)
+                )
+        self._rank = {}
+        self._high = set()
+        for quote_symbol, ranked in by_quote.items():
+            ranked.sort(reverse=True)
+            n_high = math.ceil(len(ranked) * self._high_share)
+            rate = rates.get(quote_symbol)
+            for i, (quote_volume, symbol) in enumerate(ranked):
+                self._rank[symbol] = i / len(ranked)
+                if i < n_high and (
+                    rate is None or quote_volume * rate >= self._quote_volume_floor
+                ):
+                    self._high.add(symbol)
+
+        tiers = [self.tier(symbol) for symbol in self._activity]
+        logger.info(
+            f"Activity refreshed: {tiers.count(self.HIGH)} high, "
+            f"{tiers.count(self.LOW)} low, {tiers.count(self.IDLE)} idle."
+        )
+
+    def quote_rates(self) -> Dict[str, float]:
+        """Get the price of the quote assets in the reference quote.
+
+        Prices are the volume weighted average of the quote asset's pair in the
+        reference quote over the lookback, e.g. BTCUSDT for BTC.
+
+        Returns:
+            Price per quote asset, missing if it has no pair in the reference.
+        """
+        rates = {self.reference_quote: 1.0}
+        for quote_symbol in self._quote_symbols:
+            pair = self._activity.get(quote_symbol + self.reference_quote)
+            if pair and pair[2] > 0:
+                rates[quote_symbol] = pair[1] / pair[2]
+        return rates
+
+    def quote_of(self, symbol: str) -> str:
+        """Get quote asset of the symbol, empty if not a known quote asset."""
+        for quote_symbol in self._quote_symbols:
+            if symbol.endswith(quote_symbol):
+                return quote_symbol
+        return ""
+
+    def tier(self, symbol: str) -> int:
+        """Get polling tier of the symbol."""
+        if symbol not in self._activity:
+            # NO HISTORY YET, BACKFILL AS FAST AS POSSIBLE
+            return self.HIGH
+        if symbol in self._high:
+            return self.HIGH
+        elif self._activity[symbol][0] > 0:
+            return self.LOW
+        else:
+            return self.IDLE
+
+    def select(self, keys: List[Tuple[str, int]], now: int) -> List[Tuple[str, int]]:
+        """Get keys due for polling, highest priority first."""
+        due = []
+        for symbol, start_time in keys:
+            behind = (now - start_time) // self._interval_ms
+            last_polled = self._last_polled.get(symbol)
+            if (
+                last_polled is None
+                or behind >= self._lookback_intervals
+                or now - last_polled >= self._every_ms[self.tier(symbol)]
+            ):
+                due.append((symbol, start_time))
+
+        due.sort(key=lambda k: (self.tier(k[0]), self._rank.get(k[0], 0.0)))
+        for symbol, _ in due:
+            self._last_polled[symbol] = now
+
+        return due
+
+    def limit(self, start_time: int, now: int) -> int:
+        """Get request limit needed to catch up from the start time."""
+        behind = max(0, (now - start_time) // self._interval_ms)
+        return min(self.max_limit, behind + 2)
@@ -0,0 +1,112 @@
+"""Kline cache API.
+
+Serves the kline cache over HTTP:
+
+- ``GET /klines/{symbol}?limit=N``: last N closed klines of the symbol, oldest
+  first (404 if the symbol has no persisted klines).
+- ``GET /symbols``: cached symbols.
+"""
+
+from datetime import datetime
+from decimal import Decimal
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+import json
+import logging
+import threading
+from typing import Any, Dict
+from urllib.parse import parse_qs, urlparse
+
+from binance_spot_loader.cache import KlineCache
+from binance_spot_loader.model import Kline
+
+logger = logging.getLogger(__name__)
+
+_FIELDS = (
+    "id",
+    "symbol",
+    "open_time",
+    "open_price",
+    "high_price",
+    "low_price",
+    "close_price",
+    "volume",
+    "close_time",
+    "quote_volume",
+    "trades",
+    "taker_buy_volume",
+    "taker_buy_quote_volume",
+)
+
+
+def _kline_to_dict(kline: Kline) -> Dict[str, Any]:
+    res = {}
+    for field, value in zip(_FIELDS, kline.as_tuple()):
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        elif isinstance(value, Decimal):
+            value = str(value)
+        res[field] = value
+    return res
+
+
+class CacheRequestHandler(BaseHTTPRequestHandler):
+    """Kline cache request handler."""
+
+    cache: KlineCache
+    default_limit = 100
+
+    def do_GET(self) -> None:  # noqa: N802
+        """Handle GET requests."""
+        url = urlparse(self.path)
+        parts = [p for p in url.path.split("/") if p]
+
+        if parts == ["symbols"]:
+            self._respond(HTTPStatus.OK, self.cache.symbols())
+        elif len(parts) == 2 and parts[0] == "klines":
+            params = parse_qs(url.query)
+            try:
+                limit = int(params.get("limit", [self.default_limit])[0])
+            except ValueError:
+                self._respond(HTTPStatus.BAD_REQUEST, {"error": "invalid limit"})
+                return
+            klines = self.cache.get(parts[1].upper(), limit)
+            if klines is None:
+                self._respond(HTTPStatus.NOT_FOUND, {"error": "symbol not cached"})
+            else:
+                self._respond(HTTPStatus.OK, [_kline_to_dict(k) for k in klines])
+        else:
+            self._respond(HTTPStatus.NOT_FOUND, {"error": "not found"})
+
+    def _respond(self, status: HTTPStatus, body: Any) -> None:
+        payload = json.dumps(body).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(payload)))
+        self.end_headers()
+        self.wfile.write(payload)
+
+    def log_message(self, format: str, *args: Any) -> None:  # noqa: A002
+        """Log requests at debug level only."""
+        logger.debug(format % args)
+
+
+def serve(cache: KlineCache, host: str, port: int) -> ThreadingHTTPServer:
+    """Serve the cache from a background thread.
+
+    Args:
+        cache: Kline cache to serve.
+        host: Address to bind.
+        port: Port to bind.
+
+    Returns:
+        The running server, call shutdown() to stop it.
+    """
+    handler = type("Handler", (CacheRequestHandler,), {"cache": cache})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(
+        target=server.serve_forever, name="cache-server", daemon=True
+    ).start()
+    logger.info(f"Serving kline cache on {host}:{port}.")
+    return server
@@ -0,0 +1,51 @@
+"""Supervision helpers."""
+
+import logging
+import time
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+
+def backoff(failures: int, base_seconds: float, max_seconds: float) -> float:
+    """Get the delay in seconds after consecutive failures, doubling each time."""
+    return min(max_seconds, base_seconds * 2 ** max(0, failures - 1))
+
+
+class Quarantine:
+    """Symbols quarantined with exponential backoff after failing."""
+
+    def __init__(self, base_seconds: float = 60, max_seconds: float = 3600) -> None:
+        """Symbol quarantine.
+
+        Args:
+            base_seconds: Quarantine after the first failure.
+            max_seconds: Upper bound of the quarantine.
+        """
+        self._base_seconds = base_seconds
+        self._max_seconds = max_seconds
+        self._failures: Dict[str, int] = {}
+        self._until: Dict[str, float] = {}
+
+    def failure(self, symbol: str) -> None:
+        """Record a failure, quarantining the symbol."""
+        failures = self._failures.get(symbol, 0) + 1
+        self._failures[symbol] = failures
+        delay = backoff(failures, self._base_seconds, self._max_seconds)
+        self._until[symbol] = time.monotonic() + delay
+        logger.warning(
+            f"Quarantined {symbol} for {delay:.0f}s ({failures} consecutive failures)."
+        )
+
+    def success(self, symbol: str) -> None:
+        """Record a success, releasing the symbol."""
+        if self._failures.pop(symbol, None) is not None:
+            self._until.pop(symbol, None)
+            logger.info(f"Released {symbol} from quarantine.")
+
+    def is_quarantined(self, symbol: str) -> bool:
+        """Whether the symbol is still quarantined."""
+        return self._until.get(symbol, 0) > time.monotonic()
+
+    def __len__(self) -> int:
+        return sum(1 for symbol in self._until if self.is_quarantined(symbol))
@@ -0,0 +1,331 @@
+"""Kline validation.
+
+Checks run on whole pages of raw klines at once. A page is transposed into
+columns and every check compares columns element-wise with ``map`` over
+``operator`` functions, so the per-row work happens in C rather than in a
+Python loop.
+"""
+
+from abc import ABC, abstractmethod
+from collections import Counter
+from datetime import datetime, timedelta
+from itertools import repeat
+import json
+import operator
+from typing import Dict, List, Optional, Sequence, Tuple
+
+import binance_spot_loader.date_helpers as date_helpers
+
+MALFORMED = "malformed"
+
+# DECIMAL(24,8) HOLDS ABSOLUTE VALUES BELOW 10^16, INTEGER UP TO 2^31 - 1
+MAX_DECIMAL = 1e16
+MAX_INTEGER = 2**31
+# TIMESTAMPS (MS) CONVERTIBLE TO DATETIME
+MAX_TIMESTAMP = (datetime.max - date_helpers.EPOCH) // timedelta(milliseconds=1)
+
+
+class Page:
+    """Columns of a page of raw klines."""
+
+    def __init__(self, interval: str, records: List[List]) -> None:
+        """Page of raw klines, in the REST API layout.
+
+        Args:
+            interval: kline interval.
+            records: raw klines.
+
+        Raises:
+            ValueError: if a value can not be parsed.
+        """
+        self.interval_ms = date_helpers.interval_to_milliseconds(interval)
+        self.n = len(records)
+        columns = list(zip(*records))
+        if len(columns) < 11:
+            raise ValueError("Missing columns.")
+
+        self.open_time = list(map(int, columns[0]))
+        self.open = list(map(float, columns[1]))
+        self.high = list(map(float, columns[2]))
+        self.low = list(map(float, columns[3]))
+        self.close = list(map(float, columns[4]))
+        self.volume = list(map(float, columns[5]))
+        self.close_time = list(map(int, columns[6]))
+        self.quote_volume = list(map(float, columns[7]))
+        self.trades = list(map(int, columns[8]))
+        self.taker_buy_volume = list(map(float, columns[9]))
+        self.taker_buy_quote_volume = list(map(float, columns[10]))
+
+
+def _any_of(*flags: Sequence[bool]) -> List[bool]:
+    res = list(flags[0])
+    for f in flags[1:]:
+        res = list(map(operator.or_, res, f))
+    return res
+
+
+def _negative(column: Sequence[float]) -> List[bool]:
+    return list(map(operator.lt, column, repeat(0)))
+
+
+def _out_of_range(column: Sequence[float], bound: float) -> List[bool]:
+    # NAN COMPARES FALSE, SO IT IS FLAGGED TOGETHER WITH INF AND OVERFLOWS
+    return list(map(operator.not_, map(operator.lt, map(abs, column), repeat(bound))))
+
+
+def _out_of_timestamp_range(column: Sequence[int]) -> List[bool]:
+    return _any_of(_negative(column), map(operator.ge, column, repeat(MAX_TIMESTAMP)))
+
+
+class Check(ABC):
+    """Base page check, returns one failure flag per row.
+
+    Checks run in order and see the rows rejected by the checks before them.
+    """
+
+    name: str
+
+    @abstractmethod
+    def failures(self, page: Page, rejected: Sequence[bool]) -> List[bool]:
+        """Get failure flags of the page rows."""
+
+
+class ValueRangeCheck(Check):
+    """Values that are not finite or do not fit the target columns.
+
+    Timestamps have to convert to datetime, i.e. fall between the epoch and
+    the year 9999.
+    """
+
+    name = "out_of_range"
+
+    def failures(self, page: Page, rejected: Sequence[bool]) -> List[bool]:
+        """Get failure flags of the page rows."""
+        return _any_of(
+            *(
+                _out_of_range(column, MAX_DECIMAL)
+                for column in (
+                    page.open,
+                    page.high,
+                    page.low,
+                    page.close,
+                    page.volume,
+                    page.quote_volume,
+                    page.taker_buy_volume,
+                    page.taker_buy_quote_volume,
+                )
+            ),
+            _out_of_range(page.trades, MAX_INTEGER),
+            _out_of_timestamp_range(page.open_time),
+            _out_of_timestamp_range(page.close_time),
+        )
+
+
+class PriceRangeCheck(Check):
+    """High below low, or open/close outside the high-low range."""
+
+    name = "price_range"
+
+    def failures(self, page: Page, rejected: Sequence[bool]) -> List[bool]:
+        """Get failure flags of the page rows."""
+        return _any_of(
+            map(operator.lt, page.high, page.low),
+            map(operator.lt, page.high, map(max, page.open, page.close)),
+            map(operator.gt, page.low, map(min, page.open, page.close)),
+            _negative(page.low),
+        )
+
+
+class NegativeVolumeCheck(Check):
+    """Negative volumes or trades."""
+
+    name = "negative_volume"
+
+    def failures(self, page: Page, rejected: Sequence[bool]) -> List[bool]:
+        """Get failure flags of the page rows."""
+        return _any_of(
+            _negative(page.volume),
+            _negative(page.quote_volume),
+            _negative(page.trades),
+            _negative(page.taker_buy_volume),
+            _negative(page.taker_buy_quote_volume),
+        )
+
+
+class CloseTimeCheck(Check):
+    """Close time not one interval (minus 1 ms) after the open time."""
+
+    name = "close_time"
+
+    def failures(self, page: Page, rejected: Sequence[bool]) -> List[bool]:
+        """Get failure flags of the page rows."""
+        return list(
+            map(
+                operator.ne,
+                map(operator.sub, page.close_time, page.open_time),
+                repeat(page.interval_ms - 1),
+            )
+        )
+
+
+class DuplicateOpenTimeCheck(Check):
+    """Open time repeated within the page.
+
+    The first copy not rejected by an earlier check is kept, later copies are
+    flagged.
+    """
+
+    name = "duplicate_open_time"
+
+    def failures(self, page: Page, rejected: Sequence[bool]) -> List[bool]:
+        """Get failure flags of the page rows."""
+        if len(set(page.open_time)) == page.n:
+            return [False] * page.n
+        seen: set = set()
+        res = []
+        for t, r in zip(page.open_time, rejected):
+            if r:
+                res.append(False)
+                continue
+            res.append(t in seen)
+            seen.add(t)
+        return res
+
+
+class MonotonicCheck(Check):
+    """Open time not increasing with respect to the previous row kept."""
+
+    name = "non_monotonic"
+
+    def failures(self, page: Page, rejected: Sequence[bool]) -> List[bool]:
+        """Get failure flags of the page rows."""
+        if not any(rejected):
+            return [False] + list(map(operator.le, page.open_time[1:], page.open_time))
+        kept = [i for i, r in enumerate(rejected) if not r]
+        times = [page.open_time[i] for i in kept]
+        res = [False] * page.n
+        for i, f in zip(kept[1:], map(operator.le, times[1:], times)):
+            res[i] = f
+        return res
+
+
+default_checks: Tuple[Check, ...] = (
+    ValueRangeCheck(),
+    PriceRangeCheck(),
+    NegativeVolumeCheck(),
+    CloseTimeCheck(),
+    DuplicateOpenTimeCheck(),
+    MonotonicCheck(),
+)
+
+
+class Validator:
+    """Validates pages of raw klines, keeping pass/fail counters."""
+
+    def __init__(self, interval: str, checks: Optional[Sequence[Check]] = None) -> None:
+        """Kline validator.
+
+        Args:
+            interval: kline interval.
+            checks: Checks to run, default_checks if not provided.
+        """
+        self._interval = interval
+        self._checks = tuple(checks) if checks is not None else default_checks
+        self.passed = 0
+        self.failed = 0
+        self.reasons: Counter = Counter()
+
+    def validate(
+        self, records: List[List]
+    ) -> Tuple[List[List], List[Tuple[List, str]]]:
+        """Split a page into valid rows and rejected (row, reasons) pairs.
+
+        Args:
+            records: raw klines of a single symbol.
+
+        Returns:
+            Valid rows and rejected rows with their comma separated reasons.
+        """
+        if not records:
+            return records, []
+
+        try:
+            page = Page(self._interval, records)
+        except (ValueError, TypeError):
+            # FALL BACK TO ROW BY ROW TO ISOLATE THE ROWS THAT DO NOT PARSE
+            parsed, rejected = self._split_malformed(records)
+            valid, more_rejected = self.validate(parsed) if parsed else ([], [])
+            return valid, rejected + more_rejected
+
+        flags: Dict[str, List[bool]] = {}
+        rejected = [False] * page.n
+        for check in self._checks:
+            f = check.failures(page, rejected)
+            if any(f):
+                flags[check.name] = f
+                rejected = _any_of(rejected, f)
+
+        if not flags:
+            self.passed += page.n
+            return records, []
+
+        valid = []
+        rejected = []
+        for i, record in enumerate(records):
+            reasons = [name for name, f in flags.items() if f[i]]
+            if reasons:
+                rejected.append((record, ",".join(reasons)))
+                self.reasons.update(reasons)
+            else:
+                valid.append(record)
+        self.passed += len(valid)
+        self.failed += len(rejected)
+        return valid, rejected
+
+    def _split_malformed(
+        self, records: List[List]
+    ) -> Tuple[List[List], List[Tuple[List, str]]]:
+        parsed = []
+        rejected = []
+        for record in records:
+            try:
+                Page(self._interval, [record])
+            except (ValueError, TypeError):
+                rejected.append((record, MALFORMED))
+                self.failed += 1
+                self.reasons[MALFORMED] += 1
+                continue
+            parsed.append(record)
+        return parsed, rejected
+
+    def report(self) -> str:
+        """Get pass/fail counters as text and reset them."""
+        details = ", ".join(f"{k}: {v}" for k, v in sorted(self.reasons.items()))
+        res = f"{self.passed} passed, {self.failed} failed" + (
+            f" ({details})" if details else ""
+        )
+        self.passed = 0
+        self.failed = 0
+        self.reasons = Counter()
+        return res
+
+
+def quarantine_records(symbol: str, rejected: List[Tuple[List, str]]) -> List[Tuple]:
+    """Build quarantine table records from rejected rows.
+
+    Args:
+        symbol: symbol of the rows.
+        rejected: rejected (row, reasons) pairs.
+
+    Returns:
+        (symbol, open_time, record, reasons) tuples.
+    """
+    res = []
+    for record, reasons in rejected:
+        open_time: Optional[datetime]
+        try:
+            open_time = date_helpers.binance_timestamp_to_datetime(int(record[0]))
+        except (ValueError, TypeError, IndexError, OverflowError):
+            open_time = None
+        res.append((symbol, open_time, json.dumps(record), reasons))
+    return res
@@ -0,0 +1,109 @@
+"""Shared fixtures.
+
+The target tests run against SQLite, and against Postgres when TEST_TARGET
+holds a connection string. Every Postgres run works in a schema of its own,
+created from db/*.sql and dropped afterwards.
+"""
+
+import os
+from pathlib import Path
+from typing import Any, Callable, Iterator, List
+import uuid
+
+import psycopg2
+import psycopg2.extensions
+import pytest
+
+import binance_spot_loader.date_helpers as date_helpers
+from binance_spot_loader.model import Kline
+from binance_spot_loader.persistence import BaseTarget, SqliteTarget, Target
+
+INTERVAL = "1h"
+INTERVAL_MS = date_helpers.interval_to_milliseconds(INTERVAL)
+# 2023-01-01 00:00:00
+START_MS = 1_672_531_200_000
+
+_DB_DIR = os.path.join(os.path.dirname(os.path.dirname(__file__)), "db")
+_SCHEMA = (
+    "spot_1h.sql",
+    "spot_1h_id.sql",
+    "spot_1h_latest.sql",
+    "spot_1h_quarantine.sql",
+)
+
+
+def _postgres_target() -> Iterator[BaseTarget]:
+    dsn = os.environ.get("TEST_TARGET")
+    if not dsn:
+        pytest.skip("TEST_TARGET not set.")
+
+    schema = f"test_{uuid.uuid4().hex[:12]}"
+    admin = psycopg2.connect(dsn)
+    admin.autocommit = True
+    with admin.cursor() as cursor:
+        cursor.execute(f"CREATE SCHEMA {schema};")
+        cursor.execute(f"SET search_path TO {schema};")
+        for name in _SCHEMA:
+            with open(os.path.join(_DB_DIR, name)) as f:
+                cursor.execute(f.read())
+
+    target_ = Target(
+        psycopg2.extensions.make_dsn(dsn, options=f"-c search_path={schema}")
+    )
+    try:
+        yield target_
+    finally:
+        target_.rollback_transaction()
+        target_.connection.close()
+        with admin.cursor() as cursor:
+            cursor.execute(f"DROP SCHEMA {schema} CASCADE;")
+        admin.close()
+
+
+@pytest.fixture(params=["sqlite", "postgres"])
+def target(request: pytest.FixtureRequest, tmp_path: Path) -> Iterator[BaseTarget]:
+    """Empty target of every backend."""
+    if request.param == "sqlite":
+        yield SqliteTarget(str(tmp_path / "binance.db"))
+    else:
+        yield from _postgres_target()
+
+
+@pytest.fixture
+def raw_klines() -> Callable[..., List[List]]:
+    """Build raw klines, in the REST API layout, one interval apart."""
+
+    def build(n: int, start: int = START_MS, price: str = "100.5") -> List[List]:
+        return [
+            [
+                start + i * INTERVAL_MS,
+                price,
+                "101.25",
+                "99.75",
+                "100.125",
+                "12.5",
+                start + (i + 1) * INTERVAL_MS - 1,
+                "1256.25",
+                42 + i,
+                "6.25",
+                "628.125",
+                "0",
+            ]
+            for i in range(n)
+        ]
+
+    return build
+
+
+@pytest.fixture
+def klines(
+    target: BaseTarget, raw_klines: Callable[..., List[List]]
+) -> Callable[..., List[Kline]]:
+    """Build klines of a symbol with ids from the target."""
+
+    def build(symbol: str, n: int, **kwargs: Any) -> List[Kline]:
+        return Kline.build_records(
+            target.get_next_ids(INTERVAL, n), symbol, raw_klines(n, **kwargs)
+        )
+
+    return build
@@ -0,0 +1,105 @@
+"""Kline cache."""
+
+from typing import Callable, List
+
+import pytest
+
+import binance_spot_loader.cache as cache
+from binance_spot_loader.cache import KlineCache
+from binance_spot_loader.model import Kline
+
+from tests.conftest import INTERVAL_MS, START_MS
+
+
+@pytest.fixture
+def build(raw_klines: Callable[..., List[List]]) -> Callable[..., List[Kline]]:
+    """Build klines of a symbol without a target."""
+
+    def build(symbol: str, n: int, start: int = START_MS, **kwargs: str) -> List[Kline]:
+        ids = list(range(start // INTERVAL_MS, start // INTERVAL_MS + n))
+        return Kline.build_records(ids, symbol, raw_klines(n, start=start, **kwargs))
+
+    return build
+
+
+def test_ring_buffer(build: Callable[..., List[Kline]]) -> None:
+    """Only the last klines of a symbol are kept, older ones are ignored."""
+    klines = build("BTCUSDT", 5)
+    kline_cache = KlineCache(3, 10)
+    kline_cache.add("BTCUSDT", klines[:4])
+    kline_cache.add("BTCUSDT", klines[4:])
+    assert kline_cache.get("BTCUSDT", 10) == klines[2:]
+    assert kline_cache.get("BTCUSDT", 2) == klines[3:]
+    assert kline_cache.get("BTCUSDT", 0) == []
+
+    # E.G. A REPLAYED SPOOL SEGMENT
+    kline_cache.add("BTCUSDT", klines[:2])
+    assert kline_cache.get("BTCUSDT", 10) == klines[2:]
+
+    assert kline_cache.get("ETHUSDT", 10) is None
+
+
+def test_replace_last(build: Callable[..., List[Kline]]) -> None:
+    """A kline with the open time of the last cached one replaces it."""
+    klines = build("BTCUSDT", 3)
+    updated = build("BTCUSDT", 1, start=START_MS + 2 * INTERVAL_MS, price="105")
+    kline_cache = KlineCache(3, 10)
+    kline_cache.add("BTCUSDT", klines)
+    kline_cache.add("BTCUSDT", updated)
+    assert kline_cache.get("BTCUSDT", 10) == klines[:2] + updated
+
+
+def test_lru_eviction(build: Callable[..., List[Kline]]) -> None:
+    """The least recently used symbols are evicted."""
+    kline_cache = KlineCache(3, 2)
+    kline_cache.add("BTCUSDT", build("BTCUSDT", 1))
+    kline_cache.add("ETHUSDT", build("ETHUSDT", 1))
+    kline_cache.get("BTCUSDT", 1)
+    kline_cache.add("XRPUSDT", build("XRPUSDT", 1))
+    assert sorted(kline_cache.symbols()) == ["BTCUSDT", "XRPUSDT"]
+
+
+def test_seed(build: Callable[..., List[Kline]]) -> None:
+    """Symbols are seeded with their persisted klines on first use."""
+    persisted = {"BTCUSDT": build("BTCUSDT", 3), "ETHUSDT": build("ETHUSDT", 3)}
+    calls = []
+
+    def seed(symbol: str, n: int) -> List[Kline]:
+        calls.append(symbol)
+        return persisted.get(symbol, [])[-n:]
+
+    kline_cache = KlineCache(4, 10, seed=seed)
+    assert kline_cache.get("BTCUSDT", 10) == persisted["BTCUSDT"]
+
+    new = build("ETHUSDT", 2, start=START_MS + 3 * INTERVAL_MS)
+    kline_cache.add("ETHUSDT", new)
+    assert kline_cache.get("ETHUSDT", 10) == persisted["ETHUSDT"][1:] + new
+    assert calls == ["BTCUSDT", "ETHUSDT"]
+
+
+def test_seed_miss(
+    build: Callable[..., List[Kline]], monkeypatch: pytest.MonkeyPatch
+) -> None:
+    """Symbols without persisted klines are not looked up again for a while."""
+    now = [1000.0]
+    monkeypatch.setattr(cache.time, "monotonic", lambda: now[0])
+    calls = []
+
+    def seed(symbol: str, n: int) -> List[Kline]:
+        calls.append(symbol)
+        return []
+
+    kline_cache = KlineCache(3, 10, seed=seed, miss_seconds=60)
+    assert kline_cache.get("BTCUSDT", 10) is None
+    assert kline_cache.get("BTCUSDT", 10) is None
+    assert calls == ["BTCUSDT"]
+
+    now[0] += 60
+    assert kline_cache.get("BTCUSDT", 10) is None
+    assert calls == ["BTCUSDT", "BTCUSDT"]
+
+    # PERSISTED KLINES ARE SEEDED DESPITE THE MISS
+    klines = build("BTCUSDT", 1)
+    kline_cache.add("BTCUSDT", klines)
+    assert calls == ["BTCUSDT"] * 3
+    assert kline_cache.get("BTCUSDT", 10) == klines
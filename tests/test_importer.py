@@ -0,0 +1,27 @@
+"""Archive importer."""
+
+from typing import Callable, List
+
+from binance_spot_loader.importer import Importer
+from binance_spot_loader.model import Kline
+from binance_spot_loader.persistence import BaseTarget
+
+from tests.conftest import INTERVAL, INTERVAL_MS, START_MS
+
+
+def test_hand_off(target: BaseTarget, klines: Callable[..., List[Kline]]) -> None:
+    """Symbols whose archives stop before the others are handed off inactive."""
+    btc = klines("BTCUSDT", 24)
+    eth = klines("ETHUSDT", 12)
+    doge = klines("DOGEUSDT", 24, start=START_MS - 12 * INTERVAL_MS)
+
+    Importer(target, INTERVAL, 1).hand_off(
+        {"BTCUSDT": btc[-1], "ETHUSDT": eth[-1], "DOGEUSDT": doge[-1]}
+    )
+
+    latest = {k[0]: (k[1], k[2]) for k in target.get_latest(INTERVAL) or []}
+    assert latest == {
+        "BTCUSDT": (btc[-1].open_time, True),
+        "ETHUSDT": (eth[-1].open_time, False),
+        "DOGEUSDT": (doge[-1].open_time, False),
+    }
@@ -0,0 +1,98 @@
+"""Polling scheduler."""
+
+from binance_spot_loader.scheduler import Scheduler
+
+from tests.conftest import INTERVAL, INTERVAL_MS, START_MS
+
+QUOTE_SYMBOLS = ["USDT", "TUSD", "BTC", "ETH"]
+
+
+def _scheduler(**kwargs: float) -> Scheduler:
+    scheduler = Scheduler(INTERVAL, QUOTE_SYMBOLS, high_share=0.5, **kwargs)
+    scheduler.update(
+        [
+            # (symbol, trades, quote volume, volume)
+            ("BTCUSDT", 1000, 2_000_000.0, 100.0),
+            ("ETHUSDT", 500, 1_000_000.0, 1000.0),
+            ("DOGEUSDT", 10, 1_000.0, 10_000.0),
+            ("DEADUSDT", 0, 0.0, 0.0),
+            ("ETHBTC", 100, 50.0, 1000.0),
+            ("XRPBTC", 5, 0.1, 10_000.0),
+            ("BTCTUSD", 50, 500.0, 0.025),
+        ],
+        START_MS,
+    )
+    return scheduler
+
+
+def test_quote_of() -> None:
+    """Quote assets are matched longest first."""
+    scheduler = _scheduler()
+    assert scheduler.quote_of("BTCTUSD") == "TUSD"
+    assert scheduler.quote_of("ETHBTC") == "BTC"
+    assert scheduler.quote_of("BTCBUSD") == ""
+
+
+def test_tiers_are_ranked_within_quote_asset() -> None:
+    """The top share of every quote asset is polled every cycle."""
+    scheduler = _scheduler()
+    assert scheduler.tier("BTCUSDT") == Scheduler.HIGH
+    assert scheduler.tier("ETHUSDT") == Scheduler.HIGH
+    assert scheduler.tier("DOGEUSDT") == Scheduler.LOW
+    assert scheduler.tier("DEADUSDT") == Scheduler.IDLE
+    # FAR LESS VOLUME THAN BTCUSDT, BUT THE MOST ACTIVE BTC PAIR
+    assert scheduler.tier("ETHBTC") == Scheduler.HIGH
+    assert scheduler.tier("XRPBTC") == Scheduler.LOW
+    # NO HISTORY YET
+    assert scheduler.tier("NEWUSDT") == Scheduler.HIGH
+
+
+def test_quote_volume_floor_in_reference_quote() -> None:
+    """The floor applies to quote volumes converted to the reference quote."""
+    scheduler = _scheduler(quote_volume_floor=1_500_000)
+    assert scheduler.quote_rates() == {"USDT": 1.0, "BTC": 20_000.0, "ETH": 1_000.0}
+    assert scheduler.tier("BTCUSDT") == Scheduler.HIGH
+    # 50 BTC AT 20,000 USDT
+    assert scheduler.tier("ETHBTC") == Scheduler.LOW
+    # NO TUSDUSDT PAIR TO CONVERT WITH, RANKED ONLY
+    assert scheduler.tier("BTCTUSD") == Scheduler.HIGH
+
+    scheduler = _scheduler(quote_volume_floor=500_000)
+    assert scheduler.tier("ETHBTC") == Scheduler.HIGH
+
+
+def test_select_orders_by_tier_and_skips_polled_low_activity() -> None:
+    """Low activity symbols are polled once per interval, high ones first."""
+    scheduler = _scheduler()
+    start = START_MS - 2 * INTERVAL_MS
+    keys = [("DEADUSDT", start), ("XRPBTC", start), ("BTCUSDT", start)]
+
+    assert [k[0] for k in scheduler.select(keys, START_MS)] == [
+        "BTCUSDT",
+        "XRPBTC",
+        "DEADUSDT",
+    ]
+    assert scheduler.select(keys, START_MS + 1) == [("BTCUSDT", start)]
+    assert [k[0] for k in scheduler.select(keys, START_MS + INTERVAL_MS)] == [
+        "BTCUSDT",
+        "XRPBTC",
+    ]
+
+
+def test_select_polls_symbols_far_behind() -> None:
+    """Symbols behind by the whole lookback are always polled."""
+    scheduler = _scheduler()
+    behind = START_MS - 30 * INTERVAL_MS
+    scheduler.select([("DEADUSDT", behind)], START_MS)
+    assert scheduler.select([("DEADUSDT", behind)], START_MS + 1) == [
+        ("DEADUSDT", behind)
+    ]
+
+
+def test_limit_covers_the_gap() -> None:
+    """Requests ask for the klines behind plus the open one, up to 1000."""
+    scheduler = _scheduler()
+    assert scheduler.limit(START_MS, START_MS) == 2
+    assert scheduler.limit(START_MS - 5 * INTERVAL_MS, START_MS) == 7
+    assert scheduler.limit(0, START_MS) == Scheduler.max_limit
+    assert scheduler.limit(START_MS + INTERVAL_MS, START_MS) == 2
@@ -0,0 +1,96 @@
+"""Local spool."""
+
+import os
+from pathlib import Path
+import shutil
+from typing import Callable, List
+
+from binance_spot_loader.__main__ import Loader
+from binance_spot_loader.persistence import Spool
+
+from tests.conftest import INTERVAL_MS, START_MS
+
+
+def test_replay(tmp_path: Path, raw_klines: Callable[..., List[List]]) -> None:
+    """Sealed segments are replayed by a new spool, oldest first."""
+    spool = Spool(str(tmp_path))
+    spool.append("BTCUSDT", raw_klines(3))
+    spool.append("ETHUSDT", raw_klines(2))
+    first = spool.seal()
+    spool.append("BTCUSDT", raw_klines(1, start=START_MS + 3 * INTERVAL_MS))
+    spool.close()
+    assert spool.seal() is None
+
+    spool = Spool(str(tmp_path))
+    segments = spool.segments()
+    assert len(segments) == 2
+    assert segments[0] == first
+    assert list(spool.read(segments[0])) == [
+        ("BTCUSDT", raw_klines(3)),
+        ("ETHUSDT", raw_klines(2)),
+    ]
+
+    spool.remove(segments[0])
+    assert spool.segments() == segments[1:]
+
+
+def test_torn_frame(tmp_path: Path, raw_klines: Callable[..., List[List]]) -> None:
+    """A segment left open by a crash is sealed, its torn last frame skipped."""
+    spool = Spool(str(tmp_path))
+    spool.append("BTCUSDT", raw_klines(3))
+    spool.append("ETHUSDT", raw_klines(2))
+    open_path = spool._open_path
+    spool._file.close()
+    with open(open_path, "r+b") as f:
+        f.truncate(os.path.getsize(open_path) - 5)
+
+    spool = Spool(str(tmp_path))
+    (segment,) = spool.segments()
+    assert list(spool.read(segment)) == [("BTCUSDT", raw_klines(3))]
+
+    # A NEW SEGMENT DOES NOT REUSE THE SEALED ONE
+    spool.append("BTCUSDT", raw_klines(1))
+    assert spool.seal() != segment
+
+
+def test_reject(tmp_path: Path, raw_klines: Callable[..., List[List]]) -> None:
+    """Rejected segments are moved out of the spool and never overwritten."""
+    spool = Spool(str(tmp_path))
+    spool.append("BTCUSDT", raw_klines(1))
+    first = spool.reject(spool.seal())
+    assert spool.segments() == []
+
+    # A RESTART WITH AN EMPTY SPOOL CONTINUES AFTER THE REJECTED SEGMENT
+    spool = Spool(str(tmp_path))
+    spool.append("ETHUSDT", raw_klines(1))
+    second = spool.reject(spool.seal())
+    assert second != first
+    assert list(spool.read(first)) == [("BTCUSDT", raw_klines(1))]
+    assert list(spool.read(second)) == [("ETHUSDT", raw_klines(1))]
+
+    # A COPY PUT BACK BY HAND DOES NOT OVERWRITE THE REJECTED ONE
+    shutil.copy(second, os.path.join(tmp_path, os.path.basename(second)))
+    (segment,) = spool.segments()
+    third = spool.reject(segment)
+    assert third != second
+    assert list(spool.read(third)) == [("ETHUSDT", raw_klines(1))]
+
+
+def test_rejected_symbols_are_fetched_again(
+    tmp_path: Path, raw_klines: Callable[..., List[List]]
+) -> None:
+    """Symbols of a rejected segment resume from their persisted latest kline."""
+    loader = Loader()
+    loader._interval = "1h"
+    loader._spool = Spool(str(tmp_path))
+    loader._spool.append("BTCUSDT", raw_klines(2))
+    segment = loader._spool.seal()
+    loader._next_start = {"BTCUSDT": START_MS + 2 * INTERVAL_MS, "ETHUSDT": START_MS}
+
+    loader.refetch(loader.segment_symbols(segment))
+    loader.apply_refetch()
+    assert loader._next_start == {"ETHUSDT": START_MS}
+
+    loader.refetch(None)
+    loader.apply_refetch()
+    assert loader._next_start == {}
@@ -0,0 +1,40 @@
+"""Supervision helpers."""
+
+import pytest
+
+import binance_spot_loader.supervision as supervision
+from binance_spot_loader.supervision import backoff, Quarantine
+
+
+def test_backoff() -> None:
+    """The delay doubles with every failure, up to the maximum."""
+    assert [backoff(n, 60, 600) for n in range(6)] == [60, 60, 120, 240, 480, 600]
+
+
+def test_quarantine(monkeypatch: pytest.MonkeyPatch) -> None:
+    """Failing symbols are quarantined with backoff until they succeed."""
+    now = [1000.0]
+    monkeypatch.setattr(supervision.time, "monotonic", lambda: now[0])
+    quarantine = Quarantine(base_seconds=60, max_seconds=3600)
+
+    quarantine.failure("BTCUSDT")
+    assert quarantine.is_quarantined("BTCUSDT")
+    assert not quarantine.is_quarantined("ETHUSDT")
+    assert len(quarantine) == 1
+
+    now[0] += 60
+    assert not quarantine.is_quarantined("BTCUSDT")
+    assert len(quarantine) == 0
+
+    # A SECOND CONSECUTIVE FAILURE DOUBLES THE QUARANTINE
+    quarantine.failure("BTCUSDT")
+    now[0] += 119
+    assert quarantine.is_quarantined("BTCUSDT")
+
+    quarantine.success("BTCUSDT")
+    assert not quarantine.is_quarantined("BTCUSDT")
+
+    # SUCCESS RESETS THE BACKOFF
+    quarantine.failure("BTCUSDT")
+    now[0] += 60
+    assert not quarantine.is_quarantined("BTCUSDT")
@@ -0,0 +1,229 @@
+"""Conformance of the target backends."""
+
+from datetime import datetime, timedelta
+from decimal import Decimal
+from typing import Callable, List
+
+import pytest
+
+from binance_spot_loader.model import Kline, Latest
+from binance_spot_loader.persistence import BaseTarget, Target
+from binance_spot_loader.validation import quarantine_records
+
+from tests.conftest import INTERVAL
+
+
+def _persist_latest(target: BaseTarget, latest: List[Latest]) -> None:
+    target.execute(
+        target.queries_latest(INTERVAL).UPSERT, [r.as_tuple() for r in latest]
+    )
+    target.commit_transaction()
+
+
+def _latest(kline: Kline, active: bool = True) -> Latest:
+    return Latest.build_record(
+        [kline.symbol, kline.id, kline.open_time, active, "TEST"]
+    )
+
+
+def _stored(target: BaseTarget, symbols: List[str]) -> List[tuple]:
+    """Read back every kline of the symbols."""
+    _persist_latest(
+        target,
+        [Latest.build_record([s, 0, datetime.max, True, "TEST"]) for s in symbols],
+    )
+    return list(target.stream_klines(INTERVAL, {}))
+
+
+def test_upsert_is_idempotent(
+    target: BaseTarget, klines: Callable[..., List[Kline]]
+) -> None:
+    """Upserting the same klines twice keeps one row each, with the last values."""
+    records = [k.as_tuple() for k in klines("BTCUSDT", 3)]
+    target.execute(target.queries(INTERVAL).UPSERT, records)
+    target.commit_transaction()
+
+    updated = [k.as_tuple() for k in klines("BTCUSDT", 3, price="200.5")]
+    target.execute(target.queries(INTERVAL).UPSERT, updated)
+    target.execute(target.queries(INTERVAL).UPSERT, updated)
+    target.commit_transaction()
+
+    stored = _stored(target, ["BTCUSDT"])
+    assert [r[2] for r in stored] == [r[2] for r in records]
+    assert [r[3] for r in stored] == [Decimal("200.5")] * 3
+
+
+def test_append_skips_existing_rows(
+    target: BaseTarget, klines: Callable[..., List[Kline]]
+) -> None:
+    """Appending existing klines neither duplicates nor overwrites them."""
+    records = [k.as_tuple() for k in klines("BTCUSDT", 3)]
+    target.execute(target.queries(INTERVAL).APPEND, records)
+    target.commit_transaction()
+
+    overlapping = [k.as_tuple() for k in klines("BTCUSDT", 5, price="200.5")]
+    target.execute(target.queries(INTERVAL).APPEND, overlapping)
+    target.commit_transaction()
+
+    stored = _stored(target, ["BTCUSDT"])
+    assert len(stored) == 5
+    assert [r[3] for r in stored] == [Decimal("100.5")] * 3 + [Decimal("200.5")] * 2
+
+
+def test_values_round_trip(
+    target: BaseTarget, klines: Callable[..., List[Kline]]
+) -> None:
+    """Stored klines come back with the same values and types."""
+    records = [k.as_tuple() for k in klines("ETHBTC", 2)]
+    target.execute(target.queries(INTERVAL).UPSERT, records)
+    target.commit_transaction()
+
+    assert [tuple(r) for r in _stored(target, ["ETHBTC"])] == records
+
+
+def test_recent_klines(target: BaseTarget, klines: Callable[..., List[Kline]]) -> None:
+    """The last closed klines of a symbol come back oldest first."""
+    btc = klines("BTCUSDT", 5)
+    eth = klines("ETHUSDT", 2)
+    target.execute(target.queries(INTERVAL).UPSERT, [k.as_tuple() for k in btc + eth])
+    # THE LAST BTC KLINE IS STILL OPEN
+    _persist_latest(target, [_latest(btc[3]), _latest(eth[1])])
+
+    recent = target.get_recent_klines(INTERVAL, "BTCUSDT", 3)
+    assert [tuple(r) for r in recent] == [k.as_tuple() for k in btc[1:4]]
+    assert len(target.get_recent_klines(INTERVAL, "ETHUSDT", 10)) == 2
+    assert target.get_recent_klines(INTERVAL, "XRPUSDT", 10) == []
+
+
+def test_activity(target: BaseTarget, klines: Callable[..., List[Kline]]) -> None:
+    """Trades and volumes are summed per symbol from the given open time."""
+    btc = klines("BTCUSDT", 3)
+    eth = klines("ETHUSDT", 1)
+    target.execute(target.queries(INTERVAL).UPSERT, [k.as_tuple() for k in btc + eth])
+    target.commit_transaction()
+
+    activity = sorted(target.get_activity(INTERVAL, btc[1].open_time) or [])
+    # TRADES ARE 42, 43, 44...
+    assert activity == [("BTCUSDT", 43 + 44, 2 * 1256.25, 2 * 12.5)]
+    assert target.get_activity(INTERVAL, btc[2].open_time + timedelta(1)) is None
+
+
+def test_next_ids_are_contiguous(target: BaseTarget) -> None:
+    """Ids are handed out in contiguous, increasing blocks."""
+    first = target.get_next_ids(INTERVAL, 100)
+    second = target.get_next_ids(INTERVAL, 10)
+    single = target.get_next_id(INTERVAL)
+    target.commit_transaction()
+
+    assert first == list(range(first[0], first[0] + 100))
+    assert second == list(range(first[-1] + 1, first[-1] + 11))
+    assert single == second[-1] + 1
+    assert target.get_next_ids(INTERVAL, 0) == []
+
+
+def test_latest_and_inactive_symbols(
+    target: BaseTarget, klines: Callable[..., List[Kline]]
+) -> None:
+    """Latest closed klines are read back with their trading status."""
+    assert target.get_latest(INTERVAL) is None
+    assert target.get_inactive_symbols(INTERVAL) is None
+
+    btc = klines("BTCUSDT", 2)
+    eth = klines("ETHUSDT", 1)
+    _persist_latest(target, [_latest(btc[0]), _latest(eth[0], active=False)])
+
+    assert sorted(target.get_latest(INTERVAL) or []) == [
+        ("BTCUSDT", btc[0].open_time, True),
+        ("ETHUSDT", eth[0].open_time, False),
+    ]
+    assert target.get_inactive_symbols(INTERVAL) == ["ETHUSDT"]
+
+    _persist_latest(target, [_latest(btc[1])])
+    assert ("BTCUSDT", btc[1].open_time, True) in (target.get_latest(INTERVAL) or [])
+
+
+def test_correct_trading_status(
+    target: BaseTarget, klines: Callable[..., List[Kline]]
+) -> None:
+    """Inactive symbols trading again are reinstated."""
+    eth = klines("ETHUSDT", 1)
+    bnb = klines("BNBUSDT", 1)
+    _persist_latest(
+        target, [_latest(eth[0], active=False), _latest(bnb[0], active=False)]
+    )
+
+    target.execute(
+        target.queries_latest(INTERVAL).CORRECT_TRADING_STATUS, [("ETHUSDT", True)]
+    )
+    target.commit_transaction()
+
+    assert target.get_inactive_symbols(INTERVAL) == ["BNBUSDT"]
+    assert ("ETHUSDT", eth[0].open_time, True) in (target.get_latest(INTERVAL) or [])
+
+
+def test_stream_klines_filters_by_watermark(
+    target: BaseTarget, klines: Callable[..., List[Kline]]
+) -> None:
+    """Only closed klines after the exported open time of each symbol stream."""
+    btc = klines("BTCUSDT", 5)
+    eth = klines("ETHUSDT", 3)
+    target.execute(target.queries(INTERVAL).UPSERT, [k.as_tuple() for k in btc + eth])
+    # THE LAST BTC KLINE IS STILL OPEN
+    _persist_latest(target, [_latest(btc[3]), _latest(eth[2])])
+
+    exported = {"BTCUSDT": btc[1].open_time, "XRPUSDT": datetime(2020, 1, 1)}
+    streamed = list(target.stream_klines(INTERVAL, exported, itersize=2))
+
+    assert [(r[1], r[2]) for r in streamed] == [
+        ("BTCUSDT", btc[2].open_time),
+        ("BTCUSDT", btc[3].open_time),
+    ] + [("ETHUSDT", k.open_time) for k in eth]
+
+    exported = {"BTCUSDT": btc[3].open_time, "ETHUSDT": eth[2].open_time}
+    assert list(target.stream_klines(INTERVAL, exported)) == []
+
+    exported = {"ETHUSDT": eth[0].open_time - timedelta(hours=1)}
+    assert len(list(target.stream_klines(INTERVAL, exported))) == 7
+
+
+def _quarantined(target: BaseTarget) -> List[tuple]:
+    cursor = target.connection.cursor()
+    cursor.execute("SELECT symbol, open_time, reasons FROM spot_1h_quarantine;")
+    return [tuple(r) for r in cursor.fetchall()]
+
+
+def test_quarantine(target: BaseTarget, raw_klines: Callable[..., List[List]]) -> None:
+    """Rejected rows are kept with their reasons."""
+    records = raw_klines(1)
+    target.execute(
+        target.queries(INTERVAL).QUARANTINE,
+        quarantine_records(
+            "BTCUSDT", [(records[0], "price_range"), (["x"], "malformed")]
+        ),
+    )
+    target.commit_transaction()
+
+    rows = sorted(_quarantined(target), key=lambda r: r[2])
+    assert [(r[0], r[2]) for r in rows] == [
+        ("BTCUSDT", "malformed"),
+        ("BTCUSDT", "price_range"),
+    ]
+    assert rows[0][1] is None
+
+
+def test_missing_quarantine_table_is_created(
+    target: BaseTarget, raw_klines: Callable[..., List[List]]
+) -> None:
+    """Postgres deployments older than the quarantine table get it on connect."""
+    if not isinstance(target, Target):
+        pytest.skip("SQLite targets create their tables on connect.")
+    target.connection.cursor().execute("DROP TABLE spot_1h_quarantine;")
+    target.commit_transaction()
+    target.connection.close()
+
+    target.execute(
+        target.queries(INTERVAL).QUARANTINE,
+        quarantine_records("BTCUSDT", [(raw_klines(1)[0], "price_range")]),
+    )
+    target.commit_transaction()
+    assert len(_quarantined(target)) == 1
@@ -0,0 +1,40 @@
+"""Throughput of bulk writes into the target backends."""
+
+import time
+from typing import Callable, List
+
+from binance_spot_loader.model import Kline
+from binance_spot_loader.persistence import BaseTarget
+
+from tests.conftest import INTERVAL
+
+N_SYMBOLS = 20
+N_KLINES = 1000
+# FLOOR WELL BELOW WHAT A LAPTOP DOES, TO CATCH REGRESSIONS, NOT TO BENCHMARK
+MIN_ROWS_PER_SECOND = 5_000
+
+
+def _write(target: BaseTarget, instruction: str, records: List[tuple]) -> float:
+    start = time.perf_counter()
+    target.execute(instruction, records)
+    target.commit_transaction()
+    return len(records) / (time.perf_counter() - start)
+
+
+def test_bulk_write_throughput(
+    target: BaseTarget, klines: Callable[..., List[Kline]]
+) -> None:
+    """Bulk APPEND and UPSERT of a page per symbol stay above the floor."""
+    records = [
+        k.as_tuple() for i in range(N_SYMBOLS) for k in klines(f"SYM{i}USDT", N_KLINES)
+    ]
+
+    append_rate = _write(target, target.queries(INTERVAL).APPEND, records)
+    upsert_rate = _write(target, target.queries(INTERVAL).UPSERT, records)
+    print(
+        f"{type(target).__name__}: {len(records)} rows, "
+        f"append {append_rate:,.0f} rows/s, upsert {upsert_rate:,.0f} rows/s."
+    )
+
+    assert append_rate >= MIN_ROWS_PER_SECOND
+    assert upsert_rate >= MIN_ROWS_PER_SECOND
@@ -0,0 +1,168 @@
+"""Kline validation."""
+
+from datetime import datetime
+import json
+from typing import Callable, List
+
+import pytest
+
+from binance_spot_loader.validation import (
+    MAX_TIMESTAMP,
+    quarantine_records,
+    Validator,
+)
+
+from tests.conftest import INTERVAL, INTERVAL_MS, START_MS
+
+
+@pytest.mark.parametrize("value", ["nan", "inf", "-inf", "1e30", "1e16"])
+def test_non_finite_and_overflowing_values_are_rejected(
+    raw_klines: Callable[..., List[List]], value: str
+) -> None:
+    """Values that would store NaN or overflow DECIMAL(24,8) are rejected."""
+    for column in (1, 5, 7):
+        records = raw_klines(3)
+        records[1][column] = value
+
+        valid, rejected = Validator(INTERVAL).validate(records)
+
+        assert valid == [records[0], records[2]]
+        assert [r for r, _ in rejected] == [records[1]]
+        assert "out_of_range" in rejected[0][1]
+
+
+def test_duplicate_keeps_first_valid_copy(
+    raw_klines: Callable[..., List[List]],
+) -> None:
+    """A duplicate replaces a first copy rejected for another reason."""
+    records = raw_klines(3)
+    bad_copy = list(records[1])
+    # HIGH BELOW LOW
+    bad_copy[2] = "1"
+    records.insert(1, bad_copy)
+
+    valid, rejected = Validator(INTERVAL).validate(records)
+
+    assert valid == [records[0], records[2], records[3]]
+    assert rejected == [(bad_copy, "price_range")]
+
+
+def test_later_duplicates_are_rejected(raw_klines: Callable[..., List[List]]) -> None:
+    """Of valid copies of an open time, only the first is kept."""
+    records = raw_klines(2)
+    records.append(list(records[1]))
+
+    valid, rejected = Validator(INTERVAL).validate(records)
+
+    assert valid == records[:2]
+    assert rejected == [(records[2], "duplicate_open_time")]
+
+
+@pytest.mark.parametrize(
+    "column, value",
+    [(0, -INTERVAL_MS), (0, MAX_TIMESTAMP), (0, 10**18), (6, 10**18), (6, -1)],
+)
+def test_timestamps_out_of_range_are_rejected(
+    raw_klines: Callable[..., List[List]], column: int, value: int
+) -> None:
+    """Timestamps that do not convert to datetime are rejected."""
+    records = raw_klines(3)
+    records[1][column] = value
+    if column == 0:
+        records[1][6] = value + INTERVAL_MS - 1
+
+    valid, rejected = Validator(INTERVAL).validate(records)
+
+    assert valid == [records[0], records[2]]
+    assert "out_of_range" in rejected[0][1]
+
+
+@pytest.mark.parametrize("column", [5, 7, 8, 9, 10])
+def test_negative_volume_is_rejected(
+    raw_klines: Callable[..., List[List]], column: int
+) -> None:
+    """Negative volumes and trades are rejected."""
+    records = raw_klines(2)
+    records[1][column] = -1
+
+    valid, rejected = Validator(INTERVAL).validate(records)
+
+    assert valid == records[:1]
+    assert rejected == [(records[1], "negative_volume")]
+
+
+@pytest.mark.parametrize(
+    "high, low, open_",
+    [("99", "101", "100"), ("101.25", "99.75", "102"), ("101.25", "-1", "100")],
+)
+def test_price_range(
+    raw_klines: Callable[..., List[List]], high: str, low: str, open_: str
+) -> None:
+    """High below low, open outside the range or negative prices are rejected."""
+    records = raw_klines(2)
+    records[0][1:5] = [open_, high, low, "100"]
+
+    valid, rejected = Validator(INTERVAL).validate(records)
+
+    assert valid == records[1:]
+    assert rejected == [(records[0], "price_range")]
+
+
+def test_misaligned_close_time_is_rejected(
+    raw_klines: Callable[..., List[List]],
+) -> None:
+    """Close time has to be one interval minus 1 ms after the open time."""
+    records = raw_klines(2)
+    records[0][6] += 1
+
+    valid, rejected = Validator(INTERVAL).validate(records)
+
+    assert valid == records[1:]
+    assert rejected == [(records[0], "close_time")]
+
+
+def test_non_monotonic_page_is_rejected(
+    raw_klines: Callable[..., List[List]],
+) -> None:
+    """Rows going back in time relative to the previous kept row are rejected."""
+    records = raw_klines(3)
+    earlier = raw_klines(1, start=START_MS - INTERVAL_MS)[0]
+    records.insert(2, earlier)
+
+    valid, rejected = Validator(INTERVAL).validate(records)
+
+    assert valid == [records[0], records[1], records[3]]
+    assert rejected == [(earlier, "non_monotonic")]
+
+
+def test_report(raw_klines: Callable[..., List[List]]) -> None:
+    """The report counts passed and failed rows per reason, then resets."""
+    validator = Validator(INTERVAL)
+    records = raw_klines(3)
+    records[1][5] = "-1"
+    records.append(["x"])
+    validator.validate(records)
+
+    assert validator.report() == (
+        "2 passed, 2 failed (malformed: 1, negative_volume: 1)"
+    )
+    assert validator.report() == "0 passed, 0 failed"
+
+
+def test_quarantine_records(raw_klines: Callable[..., List[List]]) -> None:
+    """Quarantined rows keep the open time when it converts."""
+    record = raw_klines(1)[0]
+    rows = quarantine_records(
+        "BTCUSDT",
+        [(record, "price_range"), ([10**20], "out_of_range"), (["x"], "malformed")],
+    )
+
+    assert [(r[0], r[3]) for r in rows] == [
+        ("BTCUSDT", "price_range"),
+        ("BTCUSDT", "out_of_range"),
+        ("BTCUSDT", "malformed"),
+    ]
+    assert rows[0][1] == datetime(2023, 1, 1)
+    assert rows[1][1] is None
+    assert rows[2][1] is None
+    assert json.loads(rows[0][2]) == record